@@ -1,7 +1,8 @@
+import os
 import sys
 
-from ui.cli import start_cli
-from ui.gui import start_gui
+# Allow both `python src/__main__.py` and `python -m src` from the project root
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def launch():
     """
@@ -12,9 +13,11 @@ def launch():
         print("\n1) Run CLI\n2) Run GUI")
         choice = input(">> Enter your choice: ")
         if choice == '1':
+            from ui.cli import start_cli
             start_cli()
 
         elif choice == '2':
+            from ui.gui import start_gui # Tk and matplotlib are only loaded for the GUI
             start_gui()
             sys.exit(0)
 
@@ -37,6 +40,13 @@ def launch():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench": # Non-interactive batch mode
+        from ui.bench import start_bench
+        sys.exit(start_bench(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "suite": # Benchmark suite with JSON baselines
+        from ui.suite import start_suite
+        sys.exit(start_suite(sys.argv[2:]))
+
     print("\nPress Ctrl+C to exit at any time")
     run = True
     while run:
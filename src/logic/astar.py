@@ -0,0 +1,59 @@
+import heapq
+from itertools import count
+
+from logic.heuristics import manhattan, octile
+
+def astar(graph, start, goal, heuristic=None, stats=None):
+    """
+    Perform A* search on the Graph from start to goal.
+    Edge costs come from Graph.weight: at least 1 per orthogonal move and sqrt(2)
+    per diagonal one. Manhattan is only admissible on a 4-connected Graph (it
+    overestimates diagonal moves), so the default heuristic follows graph.movement.
+    Ties on f are broken towards the node closest to the goal.
+    :param graph: Graph object representing the Board.
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param heuristic: Function (node, goal) -> estimated distance; manhattan for a
+                      4-connected Graph and octile otherwise if None.
+    :param stats: Optional dict, receives "expanded" and the open list's high-water mark "queue_peak".
+    :return: List of nodes representing the path from start to goal, or empty list if no path found.
+    """
+    if heuristic is None: # Admissible for the Graph's movement model
+        heuristic = manhattan if graph.movement == "4" else octile
+    tie = count()
+    h = heuristic(start, goal)
+    heap = [(h, h, next(tie), start)]
+    g_score = {start: 0}
+    parent = {start: None}
+    closed = set()
+    expanded = 0
+    peak = 0
+    path = []
+    while heap: # While there are nodes to explore
+        if len(heap) > peak:
+            peak = len(heap)
+        _, _, _, current = heapq.heappop(heap)
+        if current in closed: # Stale entry
+            continue
+
+        if current == goal: # If we reached the goal
+            while current is not None:
+                path.append(current)
+                current = parent[current]
+            path.reverse()
+            break
+
+        closed.add(current)
+        expanded += 1
+        for neighbor in graph.edges.get(current, []):
+            g = g_score[current] + graph.weight(current, neighbor)
+            if neighbor not in closed and g < g_score.get(neighbor, float('inf')):
+                g_score[neighbor] = g
+                parent[neighbor] = current
+                h = heuristic(neighbor, goal)
+                heapq.heappush(heap, (g + h, h, next(tie), neighbor))
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+    return path
@@ -1,31 +1,193 @@
+from array import array
 from collections import deque
 
-def bfs(graph, start, goal):
+import numpy as np
+
+from logic.grid import PaddedGrid
+
+def bfs(graph, start, goal, stats=None):
     """
     Perform Breadth-First Search (BFS) on the Graph from start to goal.
     :param graph: Graph object representing the Board.
     :param start: Starting node (tuple).
     :param goal: Goal node (tuple).
+    :param stats: Optional dict, receives "expanded" and the queue's high-water mark "queue_peak".
     :return: List of nodes representing the path from start to goal, or empty list if no path found.
     """
     queue = deque([start])
     visited = set()
     parent = {start: None}
     visited.add(start)
+    path = []
+    expanded = 0
+    peak = 0
     while queue: # While there are nodes to explore
+        if len(queue) > peak:
+            peak = len(queue)
         current = queue.popleft()
 
         if current == goal: # If we reached the goal
-            path = []
             while current is not None:
                 path.append(current)
                 current = parent[current]
-            return path[::-1]  # Return reversed path
+            path.reverse()  # Return reversed path
+            break
 
+        expanded += 1
         for neighbor in graph.edges.get(current, []):
             if neighbor not in visited:
                 visited.add(neighbor)
                 parent[neighbor] = current
                 queue.append(neighbor)
 
-    return []  # No path found
\ No newline at end of file
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+    return path  # Empty if no path found
+
+def bfs_grid(board, start, goal, stats=None):
+    """
+    Perform Breadth-First Search (BFS) directly on the Board's array, without a Graph.
+    Cells are flat integer indices, the parent array is preallocated and neighbours
+    are found by adding fixed offsets, so no dict of tuples is ever built.
+    Follows the Board's movement model and explores neighbours in the same order
+    as bfs, so both return the same path.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param stats: Optional dict, receives "expanded" and the queue's high-water mark "queue_peak".
+    :return: List of nodes representing the path from start to goal, or empty list if no path found.
+    """
+    grid = PaddedGrid(board)
+    path = []
+    expanded = 0
+    peak = 0
+    if grid.inside(start) and grid.inside(goal):
+        s, g = grid.index(start), grid.index(goal)
+        free = grid.free
+        if s == g:
+            path = [start]
+        elif free[s] and free[g]: # Obstacles have no edges in the Graph either
+            moves, corners = grid.moves, grid.corners
+            parent = array('i', [-1]) * grid.size # -1 means not visited yet
+            parent[s] = s
+            queue = deque([s])
+            while queue and not path: # While there are cells to explore
+                if len(queue) > peak:
+                    peak = len(queue)
+                current = queue.popleft()
+                expanded += 1
+                for off, a, b in moves:
+                    neighbor = current + off
+                    # Diagonal moves (a != 0) also need enough free cells beside them
+                    if free[neighbor] and parent[neighbor] < 0 and (not a or free[current + a] + free[current + b] >= corners):
+                        parent[neighbor] = current
+                        if neighbor == g: # Goal reached while expanding
+                            path = grid.trace(parent, g)
+                            break
+                        queue.append(neighbor)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+    return path  # Empty if no path found
+
+def bfs_frontier(board, start, goal, stats=None):
+    """
+    Level-synchronous Breadth-First Search: the whole frontier is expanded at once with NumPy.
+    Each level gathers the neighbours of every frontier cell through the flat move
+    offsets, keeps the free unvisited ones, and writes their distance; the cost per
+    level is proportional to the frontier, not to the Board. The path is then
+    recovered by descending the distance array from the goal, so it has the same
+    length as the bfs path (it may be a different path of that length).
+    Worth it on open Boards, where frontiers hold thousands of cells; along a
+    single corridor every level holds one cell and the per-level NumPy overhead
+    makes bfs_grid faster.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param stats: Optional dict, receives "expanded", the largest frontier "queue_peak" and "levels".
+    :return: List of nodes representing the path from start to goal, or empty list if no path found.
+    """
+    grid = PaddedGrid(board)
+    path = []
+    expanded = 0
+    peak = 0
+    levels = 0
+    if grid.inside(start) and grid.inside(goal):
+        s, g = grid.index(start), grid.index(goal)
+        free = grid.free
+        mask = np.frombuffer(free, dtype=np.bool_) # Same cells, for the vectorized levels
+        if s == g:
+            path = [start]
+        elif free[s] and free[g]:
+            moves, corners = grid.moves, grid.corners
+            dist = np.full(grid.size, -1, dtype=np.int32)
+            dist[s] = 0
+            slot = np.empty(grid.size, dtype=np.int64) # Scratch array to drop duplicate neighbours
+            frontier = np.array([s], dtype=np.int64)
+            while frontier.size and dist[g] < 0: # One level per iteration
+                expanded += frontier.size
+                peak = max(peak, frontier.size)
+                levels += 1
+                reached = []
+                for off, a, b in moves:
+                    source = frontier
+                    if a: # Diagonal: keep the cells with enough free cells beside the move
+                        beside = mask[frontier + a] & mask[frontier + b] if corners == 2 else mask[frontier + a] | mask[frontier + b]
+                        source = frontier[beside]
+                    reached.append(source + off)
+                cand = np.concatenate(reached)
+                cand = cand[mask[cand] & (dist[cand] < 0)]
+                order = np.arange(cand.size)
+                slot[cand] = order
+                frontier = cand[slot[cand] == order] # One copy of each cell
+                dist[frontier] = levels
+
+            if dist[g] >= 0: # Walk down the distance gradient
+                current = g
+                cells = [g]
+                for d in range(int(dist[g]) - 1, -1, -1):
+                    for off, a, b in moves:
+                        prev = current - off
+                        if dist[prev] == d and (not a or free[prev + a] + free[prev + b] >= corners):
+                            current = prev
+                            break
+                    cells.append(current)
+                path = [grid.node(cell) for cell in reversed(cells)]
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+        stats["levels"] = levels
+    return path  # Empty if no path found
+
+def bfs_tree(grid, source):
+    """
+    Runs a full Breadth-First Search from source over a PaddedGrid.
+    Neighbours are visited in the same order as bfs_grid, so tracing the tree
+    from any goal gives the same path bfs_grid would return.
+    :param grid: PaddedGrid of the Board.
+    :param source: Source node (tuple).
+    :return: (parent, dist) arrays indexed by flat padded index; parent[source] is source,
+             unreached cells have parent and dist -1.
+    """
+    parent = array('i', [-1]) * grid.size
+    dist = array('i', [-1]) * grid.size
+    s = grid.index(source)
+    if not grid.inside(source) or not grid.free[s]:
+        return parent, dist
+    free, moves, corners = grid.free, grid.moves, grid.corners
+    parent[s] = s
+    dist[s] = 0
+    queue = deque([s])
+    while queue: # Until the whole component is reached
+        current = queue.popleft()
+        d = dist[current] + 1
+        for off, a, b in moves:
+            neighbor = current + off
+            if free[neighbor] and parent[neighbor] < 0 and (not a or free[current + a] + free[current + b] >= corners):
+                parent[neighbor] = current
+                dist[neighbor] = d
+                queue.append(neighbor)
+    return parent, dist
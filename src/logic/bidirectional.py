@@ -0,0 +1,61 @@
+def bidirectional_bfs(graph, start, goal, stats=None):
+    """
+    Perform a bidirectional Breadth-First Search on the Graph from start to goal.
+    Both searches grow one full level at a time, always on the smaller frontier,
+    and stop after the first level in which they meet.
+    :param graph: Graph object representing the Board.
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param stats: Optional dict, receives "expanded" and the largest frontier "queue_peak".
+    :return: List of nodes representing the path from start to goal, or empty list if no path found.
+    """
+    if start == goal:
+        if stats is not None:
+            stats["expanded"] = 0
+            stats["queue_peak"] = 0
+        return [start]
+
+    # parent and depth of every visited node, one of each per direction
+    parents = ({start: None}, {goal: None})
+    depths = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+    expanded = 0
+    peak = 1
+    best = None
+    while frontiers[0] and frontiers[1] and best is None:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        peak = max(peak, len(frontiers[side]))
+        parent, depth = parents[side], depths[side]
+        other = depths[1 - side]
+        next_frontier = []
+        for current in frontiers[side]:
+            expanded += 1
+            d = depth[current] + 1
+            for neighbor in graph.edges.get(current, []):
+                if neighbor in other: # Both searches meet here
+                    length = d + other[neighbor]
+                    if best is None or length < best[0]:
+                        best = (length, side, current, neighbor)
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    depth[neighbor] = d
+                    next_frontier.append(neighbor)
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+    if best is None:
+        return []  # No path found
+
+    _, side, current, neighbor = best
+    near, far = (current, neighbor) if side == 0 else (neighbor, current)
+    path = []
+    while near is not None: # start ... near
+        path.append(near)
+        near = parents[0][near]
+    path.reverse()
+    while far is not None: # far ... goal
+        path.append(far)
+        far = parents[1][far]
+    return path
@@ -1,11 +1,42 @@
 import numpy as np
-import pandas as pd
+
+from logic.connectivity import Connectivity
+from logic.generators import LAYOUTS, random_obstacles
 from logic.graph import Graph
+from logic.grid import directions
+from logic.hpa import HierarchicalPlanner
+from logic.instrument import instrumented, stage
+from logic.oracle import DistanceOracle
+from logic.smoothing import segment_cells
+
+def _frame(grid):
+    """
+    DataFrame view of a grid. pandas is only imported here, so the rest of the
+    logic layer runs without it.
+    :param grid: 2D array.
+    :return: DataFrame sharing memory with grid.
+    """
+    import pandas as pd
+    return pd.DataFrame(grid, copy=False)
+
+def _show(grid):
+    """
+    Prints a grid as a DataFrame, or as a plain array if pandas is not installed.
+    :param grid: 2D array.
+    :return: None
+    """
+    try:
+        print(_frame(grid))
+    except ImportError:
+        print(grid)
 
 class Board:
     """
     Class representing a game Board.
+    Cells are stored as a compact np.int8 array; a DataFrame view is only made for display.
     Attributes:
+        grid (np.ndarray): 2D np.int8 array with the cells of the Board.
+        costs (np.ndarray): Optional 2D small-integer array with the cost of entering each cell; None means every move costs 1.
         R (int): Number of rows in the Board.
         C (int): Number of columns in the Board.
         ix (int): Initial x-coordinate.
@@ -13,11 +44,28 @@ class Board:
         fx (int): Final x-coordinate.
         fy (int): Final y-coordinate.
         n (int): Some additional parameter (purpose can vary).
+        version (int): Incremented every time the Board's cells change.
+        rng (np.random.Generator): Random generator used to place obstacles.
+        solvable (bool): Whether random obstacles are redrawn until a path exists.
+        movement (str): Movement model: "4", "8" or "any-angle" (8-connected plus line-of-sight smoothing).
+        corner_cutting (bool): Whether diagonal moves may pass beside one occupied cell.
     """
 
-    def __init__(self, r=5, c=5, ix=0, iy=0, fx=0, fy=0, n=0):
-        self.board = None
-        self.graph = None
+    def __init__(self, r=5, c=5, ix=0, iy=0, fx=0, fy=0, n=0, rng=None, solvable=False, movement="4", corner_cutting=False):
+        self._setup(r, c, ix, iy, fx, fy, n, rng, solvable, movement, corner_cutting)
+        self._build_board()
+
+    def _setup(self, r, c, ix, iy, fx, fy, n, rng, solvable, movement, corner_cutting):
+        """
+        Sets every attribute of the Board except its cells.
+        :return: None
+        """
+        self.grid = None
+        self.costs = None
+        self._graph = None
+        self._components = None
+        self._hierarchy = None
+        self._oracle = None
         self.R = r
         self.C = c
         self.ix = ix
@@ -25,21 +73,99 @@ class Board:
         self.fx = fx
         self.fy = fy
         self.n = n
-        self._build_board()
+        self.version = 0
+        self.rng = np.random.default_rng(rng) # Pass a seed or Generator for reproducible Boards
+        self.solvable = solvable
+        directions(movement) # Validates the movement model
+        self.movement = movement
+        self.corner_cutting = corner_cutting
+
+    @classmethod
+    def from_array(cls, grid, start=None, goal=None, n=None, rng=None, movement="4", corner_cutting=False):
+        """
+        Builds a Board from given cells, without drawing random obstacles first.
+        :param grid: 2D array representing the Board (see board_from_array).
+        :param start: Initial position (tuple); found by scanning the cells if None.
+        :param goal: Final position (tuple); found by scanning the cells if None.
+        :param n: Number of obstacles; counted if None.
+        :param rng: np.random.Generator or seed kept by the Board.
+        :param movement: Movement model.
+        :param corner_cutting: Whether diagonal moves may pass beside one occupied cell.
+        :return: Board object.
+        """
+        board = cls.__new__(cls)
+        r, c = np.shape(grid)
+        board._setup(r, c, 0, 0, 0, 0, 0, rng, False, movement, corner_cutting)
+        board.board_from_array(grid, start, goal, n)
+        return board
+
+    @classmethod
+    def generate(cls, layout, r, c, rng=None, movement="4", corner_cutting=False, **options):
+        """
+        Builds a Board with a structured layout instead of random obstacles.
+        The initial and final positions are the first and last free cells (in row-major
+        order) of the largest connected region, so a path always exists; a layout
+        whose regions are all single cells raises ValueError.
+        :param layout: One of generators.LAYOUTS ("maze", "sidewinder", "rooms", "warehouse", "cave").
+        :param r: Number of rows.
+        :param c: Number of columns.
+        :param rng: np.random.Generator or seed, used by the generator.
+        :param movement: Movement model.
+        :param corner_cutting: Whether diagonal moves may pass beside one occupied cell.
+        :param options: Extra keyword arguments of the generator (e.g. fill for "cave").
+        :return: Board object.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}'. Choose one of: {', '.join(LAYOUTS)}")
+        rng = np.random.default_rng(rng)
+        grid = LAYOUTS[layout](r, c, rng, **options)
+        components = Connectivity(grid)
+        if not components.sizes.size or components.sizes.max() < 2:
+            raise ValueError(f"The '{layout}' layout left no two connected free cells on a {r} x {c} Board.")
+        cells = np.flatnonzero(components.labels.ravel() == int(np.argmax(components.sizes)))
+        start, goal = divmod(int(cells[0]), c), divmod(int(cells[-1]), c)
+        grid[start] = 1
+        grid[goal] = 2
+        board = cls.from_array(grid, start, goal, rng=rng, movement=movement, corner_cutting=corner_cutting)
+        board._components = components # Marking the positions does not change connectivity
+        return board
 
-    def board_from_df(self, board: pd.DataFrame):
+    @property
+    def board(self):
+        """
+        DataFrame view of the Board's grid, for display (needs pandas).
+        :return: DataFrame sharing memory with grid.
+        """
+        return _frame(self.grid)
+
+    def board_from_df(self, board):
         """
         Initializes the Board from a given DataFrame.
         :param board: DataFrame representing the Board.
         :return: None
         """
-        self.board = board
-        self.R, self.C = board.shape
-        self.ix, self.iy = map(int, np.argwhere(board.values == 1)[0])
-        self.fx, self.fy = map(int, np.argwhere(board.values == 2)[0])
-        self.n = np.sum(board.values == -1)
+        self.board_from_array(board.values)
+
+    def board_from_array(self, board, start=None, goal=None, n=None):
+        """
+        Initializes the Board from a given 2D array, stored as np.int8.
+        An int8 array (including an np.memmap) is used as is, without copying.
+        :param board: 2D array representing the Board.
+        :param start: Initial position (tuple); found by scanning the cells if None.
+        :param goal: Final position (tuple); found by scanning the cells if None.
+        :param n: Number of obstacles; counted if None.
+        :return: None
+        """
+        self.grid = board.astype(np.int8, copy=False) if isinstance(board, np.ndarray) else np.asarray(board, dtype=np.int8)
+        self.R, self.C = self.grid.shape
+        if self.costs is not None and self.costs.shape != self.grid.shape: # Cost map of another Board
+            self.costs = None
+        self.ix, self.iy = map(int, start if start is not None else np.argwhere(self.grid == 1)[0])
+        self.fx, self.fy = map(int, goal if goal is not None else np.argwhere(self.grid == 2)[0])
+        self.n = int(n if n is not None else np.count_nonzero(self.grid == -1))
         self._build_graph()
 
+    @instrumented("board.build")
     def _build_board(self) -> None:
         """
         Builds the game Board with initial and final positions marked.
@@ -47,24 +173,96 @@ class Board:
         1 represents the initial position,
         2 represents the final position,
         -1 represents occupied positions.
+        If the Board is solvable, obstacles are redrawn until the connectivity index
+        links both positions, without running any search.
         :return: None
         """
-        temp_positions= [] # To track occupied positions
-        temp_board = np.zeros((self.R, self.C))
-        temp_board[self.ix, self.iy] = 1 # Initial position
-        temp_board[self.fx, self.fy] = 2 # Final position
-        for i in range( self.n ):
-            rand_x = np.random.randint(0, self.R)
-            rand_y = np.random.randint(0, self.C)
-            # Ensure we don't overwrite initial or final positions or previously occupied positions
-            while (rand_x, rand_y) in temp_positions or (rand_x == self.ix and rand_y == self.iy) or (rand_x == self.fx and rand_y == self.fy):
-                rand_x = np.random.randint(0, self.R)
-                rand_y = np.random.randint(0, self.C)
-            temp_board[rand_x, rand_y] = -1  # Marking occupied position
-            temp_positions.append( (rand_x, rand_y ) ) # Track positions occupied
-        self.board = pd.DataFrame(temp_board).astype(int) # Turn into DataFrame for better visualization
+        attempts = 100 if self.solvable else 1
+        for _ in range(attempts):
+            temp_board = np.zeros((self.R, self.C), dtype=np.int8)
+            # Distinct cells, never the initial or final positions
+            obstacles = random_obstacles(self.R, self.C, self.n, [(self.ix, self.iy), (self.fx, self.fy)], self.rng)
+            temp_board.flat[obstacles] = -1 # Marking occupied positions
+            temp_board[self.ix, self.iy] = 1 # Initial position
+            temp_board[self.fx, self.fy] = 2 # Final position
+            self.grid = temp_board
+            self._build_graph()
+            if not self.solvable or self.has_path():
+                return
+        raise ValueError(f"Could not generate a solvable Board in {attempts} attempts.")
+
+    def set_movement(self, movement, corner_cutting=False):
+        """
+        Changes the movement model used by the Graph and every search.
+        The connectivity index does not depend on it: a diagonal move always has a
+        free cell beside it, so both models connect the same cells.
+        :param movement: "4", "8" or "any-angle".
+        :param corner_cutting: Whether diagonal moves may pass beside one occupied cell.
+        :return: None
+        """
+        directions(movement) # Validates the movement model
+        self.movement = movement
+        self.corner_cutting = corner_cutting
         self._build_graph()
 
+    def set_costs(self, costs):
+        """
+        Sets the traversal cost of every cell, stored alongside the grid.
+        :param costs: 2D array of integers >= 1 with the Board's shape, or None for uniform cost.
+        :return: None
+        """
+        if costs is not None:
+            costs = np.asarray(costs)
+            if costs.shape != (self.R, self.C):
+                raise ValueError(f"Cost map shape {costs.shape} does not match the Board ({self.R}, {self.C}).")
+            if costs.size and costs.min() < 1:
+                raise ValueError("Cell costs must be at least 1.")
+            if not np.array_equal(costs, np.floor(costs)): # The grid searches store costs as integers
+                raise ValueError("Cell costs must be integers.")
+            # Smallest unsigned type that holds every cost
+            costs = costs.astype(np.min_scalar_type(int(costs.max())) if costs.size else np.uint8)
+        self.costs = costs
+        self._build_graph()
+
+    def add_obstacle(self, x, y):
+        """
+        Marks a cell as occupied in place, patching the Graph instead of rebuilding it.
+        :param x: Row of the cell.
+        :param y: Column of the cell.
+        :return: True if the cell changed, False if it was already occupied.
+        """
+        return self._set_cell(x, y, -1)
+
+    def remove_obstacle(self, x, y):
+        """
+        Marks a cell as empty in place, patching the Graph instead of rebuilding it.
+        :param x: Row of the cell.
+        :param y: Column of the cell.
+        :return: True if the cell changed, False if it was already empty.
+        """
+        return self._set_cell(x, y, 0)
+
+    def _set_cell(self, x, y, value):
+        if not (0 <= x < self.R and 0 <= y < self.C):
+            raise ValueError(f"Position ({x}, {y}) out of bounds.")
+        if (x, y) in ((self.ix, self.iy), (self.fx, self.fy)):
+            raise ValueError("Initial and final positions cannot be changed.")
+        if (self.grid[x, y] == -1) == (value == -1):
+            return False
+        self.grid[x, y] = value
+        self.n += 1 if value == -1 else -1
+        self.version += 1
+        self._components = None
+        if self._graph is not None: # Patch only the edges around the cell
+            if value == -1:
+                self._graph.block((x, y))
+            else:
+                self._graph.unblock((x, y))
+        if self._hierarchy is not None: # Rebuild only the clusters around the cell
+            self._hierarchy.update([(x, y)])
+        self._oracle = None
+        return True
+
     def info(self):
         """
         Prints the Board's attributes.
@@ -80,15 +278,86 @@ class Board:
         Displays the current state of the Board.
         :return: None
         """
-        print(self.board)
+        _show(self.grid)
+
+    @property
+    def graph(self):
+        """
+        Graph representation of the Board, built on first access.
+        Array-backed searches (e.g. bfs_grid) never need it.
+        :return: Graph object.
+        """
+        if self._graph is None:
+            self._graph = Graph()
+            self._graph.build_from_board(self.grid, self.costs, "4" if self.movement == "4" else "8", self.corner_cutting)
+        return self._graph
+
+    def csr_graph(self):
+        """
+        Graph of the Board with its CSR arrays, as the oracle needs them: the current
+        Graph, or a fresh one when add_obstacle/remove_obstacle patched it.
+        :return: Graph object.
+        """
+        graph = self.graph
+        if graph.offsets is None: # Patched Graph: rebuild the CSR arrays from the Board
+            graph = Graph()
+            graph.build_from_board(self.grid, self.costs, "4" if self.movement == "4" else "8", self.corner_cutting)
+        return graph
+
+    @property
+    def components(self):
+        """
+        Connectivity index of the Board, built on first access after any change.
+        :return: Connectivity object.
+        """
+        if self._components is None:
+            self._components = Connectivity(self.grid)
+        return self._components
+
+    @property
+    def hierarchy(self):
+        """
+        Hierarchical planner (HPA*) of the Board, built on first access.
+        Obstacle changes made through the Board only rebuild the clusters around them.
+        :return: HierarchicalPlanner object.
+        """
+        if self._hierarchy is None:
+            self._hierarchy = HierarchicalPlanner(self)
+        return self._hierarchy
+
+    @property
+    def oracle(self):
+        """
+        Distance oracle (ALT landmarks, plus an all-pairs table on small Boards), built on
+        first access after any change. mapio.load_oracle sets one saved next to a map.
+        :return: DistanceOracle object.
+        """
+        if self._oracle is None:
+            self._oracle = DistanceOracle.build(self.csr_graph())
+        return self._oracle
+
+    @oracle.setter
+    def oracle(self, value):
+        self._oracle = value
+
+    def has_path(self):
+        """
+        Checks in O(1) whether the final position is reachable from the initial one.
+        :return: True if a path exists, False otherwise.
+        """
+        return self.components.connected((self.ix, self.iy), (self.fx, self.fy))
 
     def _build_graph(self):
         """
-        Builds the Graph representation of the Board.
+        Marks the Board as changed: bumps its version and discards the current Graph,
+        connectivity index, hierarchy and oracle so they are rebuilt from the Board on next access.
         :return: None
         """
-        self.graph = Graph()
-        self.graph.build_from_board(self.board.values)
+        self.version += 1
+        self._graph = None
+        self._components = None
+        self._hierarchy = None
+        self._oracle = None
 
     def draw_path(self, path):
         """
@@ -99,12 +368,58 @@ class Board:
         -1 represents occupied positions.
         3 represents the path taken.
         :param path: List of tuples representing the path coordinates.
+        :return: PathOverlay sharing this Board's grid and Graph.
+        """
+        return PathOverlay(self, path)
+
+class PathOverlay:
+    """
+    Class representing a path drawn over a Board.
+    Nothing is copied or rebuilt until the marked cells are needed for display.
+    Attributes:
+        base (Board): Board the path was drawn on.
+        path (list): List of tuples representing the path coordinates.
+    """
+
+    def __init__(self, base, path):
+        self.base = base
+        self.path = path
+        self._grid = None
+
+    @property
+    def grid(self):
+        """
+        Copy of the base grid with empty path cells marked as 3, built on first access.
+        Waypoints that are not adjacent (any-angle paths) are joined by the cells
+        of the straight segment between them.
+        :return: 2D np.int8 array.
+        """
+        if self._grid is None:
+            with stage("draw_path"):
+                grid = self.base.grid.copy()
+                if len(self.path) > 0:
+                    cells = [self.path[0]]
+                    for a, b in zip(self.path, self.path[1:]):
+                        if max(abs(a[0] - b[0]), abs(a[1] - b[1])) > 1:
+                            cells.extend(segment_cells(a, b))
+                        cells.append(b)
+                    rows, cols = np.asarray(cells).T
+                    empty = grid[rows, cols] == 0 # Only mark empty spaces
+                    grid[rows[empty], cols[empty]] = 3
+                self._grid = grid
+        return self._grid
+
+    @property
+    def board(self):
+        """
+        DataFrame view of the marked grid, for display (needs pandas).
+        :return: DataFrame sharing memory with grid.
+        """
+        return _frame(self.grid)
+
+    def display(self):
+        """
+        Displays the Board with the path drawn on it.
         :return: None
         """
-        temp_board = self.board.copy()
-        for (x, y) in path:
-            if temp_board.iat[x, y] == 0:  # Only mark empty spaces
-                temp_board.iat[x, y] = 3  # Mark the path with a distinct value
-        temp = Board()
-        temp.board_from_df(temp_board)
-        return temp
\ No newline at end of file
+        _show(self.grid)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from logic.grid import OBSTACLE, as_array
+from logic.instrument import instrumented
+
+# Cells processed at a time, so the per-cell temporaries stay bounded whatever the size of the Board
+CHUNK_CELLS = 1 << 22
+
+@instrumented("connectivity")
+def label_components(board):
+    """
+    Labels the connected components of the free cells of a Board (4-connected).
+    Horizontal runs of free cells are connected by construction, so the Board is
+    first contracted to its runs. A vectorized union-find then joins runs that
+    touch vertically: every round hooks the root of each edge's larger end onto
+    the root of its smaller end and pointer jumping flattens the trees, until
+    both ends of every edge share a root.
+    The Board is read in blocks of rows and the run ids are kept in the labels
+    array itself, so besides the labels (4 bytes per cell) memory grows with the
+    number of runs, not cells; a memory-mapped Board is only paged in.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :return: (labels, sizes) where labels is an int32 array with the Board's shape
+             (-1 for obstacles, 0..k-1 for components) and sizes[k] is the number
+             of cells of component k.
+    """
+    arr = as_array(board)
+    rows, cols = arr.shape
+    step = max(1, CHUNK_CELLS // max(cols, 1))
+    blocks = [(r0, min(r0 + step, rows)) for r0 in range(0, rows, step)]
+
+    # Run id of every free cell, -1 for obstacles
+    labels = np.empty((rows, cols), dtype=np.int32)
+    runs = 0
+    for r0, r1 in blocks:
+        free = arr[r0:r1] != OBSTACLE
+        first = free.copy() # First cell of each horizontal run
+        first[:, 1:] &= ~free[:, :-1]
+        run = np.cumsum(first.ravel(), dtype=np.int32).reshape(free.shape) + (runs - 1)
+        labels[r0:r1] = np.where(free, run, -1)
+        runs += int(np.count_nonzero(first))
+
+    # One edge per vertical overlap between two runs
+    us, vs = [], []
+    for r0, r1 in blocks:
+        block = labels[r0:min(r1 + 1, rows)]
+        down = (block[:-1] >= 0) & (block[1:] >= 0)
+        overlap = down.copy()
+        overlap[:, 1:] &= ~down[:, :-1]
+        us.append(block[:-1][overlap])
+        vs.append(block[1:][overlap])
+    u = np.concatenate(us) if us else np.zeros(0, dtype=np.int32)
+    v = np.concatenate(vs) if vs else np.zeros(0, dtype=np.int32)
+
+    parent = np.arange(runs, dtype=np.int32)
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        pending = pu != pv # Edges whose ends are still in different trees
+        u, v, pu, pv = u[pending], v[pending], pu[pending], pv[pending]
+        if not u.size:
+            break
+        # Pointers only ever go to smaller ids, so no cycles can form
+        parent[np.maximum(pu, pv)] = np.minimum(pu, pv)
+        while True: # Pointer jumping until every run points at its root
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+    roots = parent == np.arange(runs, dtype=np.int32)
+    rank = (np.cumsum(roots, dtype=np.int32) - 1)[parent] # Consecutive label of each run's root
+    sizes = np.zeros(int(roots.sum()), dtype=np.int64)
+    for r0, r1 in blocks: # Run ids -> component labels, in place
+        block = labels[r0:r1]
+        free = block >= 0
+        block[free] = rank[block[free]]
+        sizes += np.bincount(block[free], minlength=sizes.size)
+    return labels, sizes
+
+class Connectivity:
+    """
+    Connectivity index of a Board: answers "is there a path?" in O(1).
+    Attributes:
+        labels (np.ndarray): Component label of every cell, -1 for obstacles.
+        sizes (np.ndarray): Number of cells of each component.
+    """
+
+    def __init__(self, board):
+        self.labels, self.sizes = label_components(board)
+
+    def component(self, node):
+        """
+        :param node: Node (tuple).
+        :return: Label of the node's component, or -1 if it is an obstacle or out of bounds.
+        """
+        r, c = self.labels.shape
+        if not (0 <= node[0] < r and 0 <= node[1] < c):
+            return -1
+        return int(self.labels[node])
+
+    def connected(self, a, b):
+        """
+        :param a: First node (tuple).
+        :param b: Second node (tuple).
+        :return: True if there is a path between a and b, False otherwise.
+        """
+        label = self.component(a)
+        return label >= 0 and label == self.component(b)
+
+    def size(self, node):
+        """
+        :param node: Node (tuple).
+        :return: Number of cells reachable from node (itself included), 0 for obstacles.
+        """
+        label = self.component(node)
+        return int(self.sizes[label]) if label >= 0 else 0
@@ -0,0 +1,211 @@
+import heapq
+from array import array
+from itertools import count
+
+import numpy as np
+
+from logic.grid import PaddedGrid
+from logic.heuristics import SQRT2
+
+# Largest edge weight for which the bucket queue is used instead of heapq
+MAX_BUCKET_WEIGHT = 1024
+
+class BucketQueue:
+    """
+    Monotone priority queue for small non-negative integer priorities (Dial's algorithm).
+    Holds max_weight + 1 buckets in a ring: while Dijkstra runs, every queued priority
+    lies within max_weight of the current minimum, so push and pop are O(1) amortized.
+    Attributes:
+        size (int): Number of queued items.
+    """
+
+    def __init__(self, max_weight):
+        self._buckets = [[] for _ in range(max_weight + 1)]
+        self._current = 0 # Priority of the bucket being emptied
+        self.size = 0
+
+    def push(self, item, priority):
+        self._buckets[priority % len(self._buckets)].append(item)
+        self.size += 1
+
+    def pop(self):
+        """
+        :return: (priority, item) with the smallest priority.
+        """
+        buckets = self._buckets
+        while not buckets[self._current % len(buckets)]:
+            self._current += 1
+        self.size -= 1
+        return self._current, buckets[self._current % len(buckets)].pop()
+
+def dijkstra(graph, start, goal, stats=None):
+    """
+    Perform Dijkstra's search on the weighted Graph from start to goal.
+    Uses a bucket queue when the Graph's weights are small integers and heapq otherwise.
+    :param graph: Graph object representing the Board (see Graph.weight).
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param stats: Optional dict, receives "expanded", the queue's high-water mark "queue_peak" and the path "cost".
+    :return: List of nodes representing the cheapest path from start to goal, or empty list if no path found.
+    """
+    max_weight = graph.max_weight()
+    buckets = isinstance(max_weight, int) and max_weight <= MAX_BUCKET_WEIGHT
+    if buckets:
+        queue = BucketQueue(max_weight)
+        push, pop = queue.push, queue.pop
+    else:
+        heap, tie = [], count()
+        push = lambda item, priority: heapq.heappush(heap, (priority, next(tie), item))
+        pop = lambda: heapq.heappop(heap)[::2]
+
+    edges = graph.edges
+    dist = {start: 0}
+    parent = {start: None}
+    push(start, 0)
+    expanded = 0
+    peak = 0
+    path = []
+    while (queue.size if buckets else heap): # While there are nodes to explore
+        size = queue.size if buckets else len(heap)
+        if size > peak:
+            peak = size
+        d, current = pop()
+        if d > dist[current]: # Stale entry
+            continue
+        if current == goal: # If we reached the goal
+            while current is not None:
+                path.append(current)
+                current = parent[current]
+            path.reverse()
+            break
+
+        expanded += 1
+        for neighbor in edges.get(current, []):
+            nd = d + graph.weight(current, neighbor)
+            if nd < dist.get(neighbor, float('inf')):
+                dist[neighbor] = nd
+                parent[neighbor] = current
+                push(neighbor, nd)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+        stats["cost"] = dist[goal] if path else None
+    return path
+
+def dijkstra_grid(board, start, goal, costs=None, stats=None):
+    """
+    Perform Dijkstra's search directly on the Board's arrays.
+    Moving into a cell costs its value in the cost map (times sqrt(2) diagonally);
+    cells are flat integer indices as in bfs_grid, so no Graph is built.
+    With 4-connected moves every weight is a small integer and a bucket queue is used;
+    diagonal moves fall back to heapq.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param costs: 2D array of integer costs >= 1; the Board's costs (or uniform cost) if None.
+    :param stats: Optional dict, receives "expanded", the queue's high-water mark "queue_peak" and the path "cost".
+    :return: List of nodes representing the cheapest path from start to goal, or empty list if no path found.
+    """
+    if costs is None:
+        costs = getattr(board, "costs", None)
+    grid = PaddedGrid(board)
+    path, cost, expanded, peak = [], None, 0, 0
+    if grid.inside(start) and grid.inside(goal):
+        s, g = grid.index(start), grid.index(goal)
+        if s == g:
+            path, cost = [start], 0
+        elif grid.free[s] and grid.free[g]:
+            # Cost of entering each cell, padded like the grid so flat indices line up
+            padded = np.ones((grid.rows + 2, grid.width), dtype=np.int32)
+            if costs is not None:
+                padded[1:-1, 1:-1] = costs
+            weight = array('i')
+            weight.frombytes(padded.tobytes())
+            if grid.diagonal:
+                path, cost, expanded, peak = _grid_heap_search(grid, s, g, weight)
+            else:
+                path, cost, expanded, peak = _grid_bucket_search(grid, s, g, weight, int(padded.max()))
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+        stats["cost"] = cost
+    return path
+
+def _grid_bucket_search(grid, s, g, weight, max_weight):
+    """
+    Dijkstra with 4-connected moves and integer weights.
+    The bucket queue is inlined from BucketQueue: this loop runs once per cell.
+    :return: (path, cost, expanded, queue peak)
+    """
+    free, offsets = grid.free, grid.offsets
+    dist = array('q', [-1]) * grid.size # -1 means not reached yet
+    parent = array('i', [-1]) * grid.size
+    dist[s] = 0
+    parent[s] = s
+    buckets = [[] for _ in range(max_weight + 1)]
+    ring = len(buckets)
+    buckets[0].append(s)
+    queued = 1
+    d = 0
+    expanded = 0
+    peak = 0
+    while queued: # While there are cells to explore
+        bucket = buckets[d % ring]
+        if not bucket:
+            d += 1
+            continue
+        if queued > peak:
+            peak = queued
+        current = bucket.pop()
+        queued -= 1
+        if d > dist[current]: # Stale entry
+            continue
+        if current == g: # If we reached the goal
+            return grid.trace(parent, g), d, expanded, peak
+        expanded += 1
+        for off in offsets:
+            neighbor = current + off
+            if free[neighbor]:
+                nd = d + weight[neighbor]
+                old = dist[neighbor]
+                if old < 0 or nd < old:
+                    dist[neighbor] = nd
+                    parent[neighbor] = current
+                    buckets[nd % ring].append(neighbor)
+                    queued += 1
+    return [], None, expanded, peak
+
+def _grid_heap_search(grid, s, g, weight):
+    """
+    Dijkstra with the grid's movement model and heapq, for non-integer (diagonal) weights.
+    :return: (path, cost, expanded, queue peak)
+    """
+    free, moves, corners = grid.free, grid.moves, grid.corners
+    dist = array('d', [-1.0]) * grid.size # -1 means not reached yet
+    parent = array('i', [-1]) * grid.size
+    dist[s] = 0.0
+    parent[s] = s
+    heap = [(0.0, s)]
+    expanded = 0
+    peak = 0
+    while heap: # While there are cells to explore
+        if len(heap) > peak:
+            peak = len(heap)
+        d, current = heapq.heappop(heap)
+        if d > dist[current]: # Stale entry
+            continue
+        if current == g: # If we reached the goal
+            return grid.trace(parent, g), d, expanded, peak
+        expanded += 1
+        for off, a, b in moves:
+            neighbor = current + off
+            if free[neighbor] and (not a or free[current + a] + free[current + b] >= corners):
+                nd = d + (weight[neighbor] * SQRT2 if a else weight[neighbor])
+                old = dist[neighbor]
+                if old < 0 or nd < old:
+                    dist[neighbor] = nd
+                    parent[neighbor] = current
+                    heapq.heappush(heap, (nd, neighbor))
+    return [], None, expanded, peak
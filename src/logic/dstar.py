@@ -0,0 +1,144 @@
+import heapq
+from itertools import count
+
+from logic.heuristics import manhattan, octile
+
+INF = float('inf')
+EPS = 1e-9 # Diagonal weights are sums of sqrt(2): costs closer than this are equal
+
+def _less(a, b):
+    """
+    Key comparison that ignores rounding differences between sums of float weights.
+    """
+    if a[0] < b[0] - EPS:
+        return True
+    return abs(a[0] - b[0]) <= EPS and a[1] < b[1] - EPS
+
+def _differ(x, y):
+    return abs(x - y) > EPS # Both INF compare as equal (nan > EPS is False)
+
+class DStarLite:
+    """
+    Incremental planner (D* Lite) on a Board's Graph.
+    The search runs backwards from the goal, so when cells change or the robot
+    moves only the inconsistent part of the previous search is repaired.
+    Usage:
+        planner = DStarLite(board)
+        path = planner.path()
+        board.add_obstacle(x, y)
+        planner.update([(x, y)])
+        path = planner.path()
+    Attributes:
+        board (Board): Board being planned on; its Graph is patched in place by the Board.
+        start (tuple): Current position of the robot.
+        goal (tuple): Goal node.
+        expanded (int): Total number of vertex expansions so far.
+    """
+
+    def __init__(self, board, start=None, goal=None, heuristic=None):
+        self.board = board
+        self.start = start if start is not None else (board.ix, board.iy)
+        self.goal = goal if goal is not None else (board.fx, board.fy)
+        if heuristic is None: # Admissible for the Board's movement model
+            heuristic = manhattan if board.graph.movement == "4" else octile
+        self.heuristic = heuristic
+        self.expanded = 0
+        self._g = {}
+        self._rhs = {self.goal: 0}
+        self._km = 0
+        self._last = self.start
+        self._open = {} # node -> current key
+        self._heap = []
+        self._tie = count()
+        self._push(self.goal)
+        self._compute()
+
+    def _key(self, node):
+        m = min(self._g.get(node, INF), self._rhs.get(node, INF))
+        return (m + self.heuristic(self.start, node) + self._km, m)
+
+    def _push(self, node):
+        key = self._key(node)
+        self._open[node] = key
+        heapq.heappush(self._heap, (key, next(self._tie), node))
+
+    def _top(self):
+        while self._heap:
+            key, _, node = self._heap[0]
+            if self._open.get(node) == key:
+                return key
+            heapq.heappop(self._heap) # Stale entry
+        return (INF, INF)
+
+    def _update_vertex(self, node):
+        graph = self.board.graph
+        if node != self.goal:
+            self._rhs[node] = min((self._g.get(n, INF) + graph.weight(node, n) for n in graph.edges.get(node, [])), default=INF)
+        self._open.pop(node, None)
+        if _differ(self._g.get(node, INF), self._rhs.get(node, INF)):
+            self._push(node)
+
+    def _compute(self):
+        edges = self.board.graph.edges
+        g, rhs = self._g, self._rhs
+        while _less(self._top(), self._key(self.start)) or _differ(rhs.get(self.start, INF), g.get(self.start, INF)):
+            k_old, _, node = heapq.heappop(self._heap)
+            del self._open[node]
+            self.expanded += 1
+            k_new = self._key(node)
+            if _less(k_old, k_new): # Key became stale after the robot moved
+                self._push(node)
+            elif g.get(node, INF) > rhs.get(node, INF) + EPS: # Overconsistent
+                g[node] = rhs[node]
+                for n in edges.get(node, []):
+                    self._update_vertex(n)
+            else: # Underconsistent
+                g[node] = INF
+                self._update_vertex(node)
+                for n in edges.get(node, []):
+                    self._update_vertex(n)
+
+    def move_to(self, node):
+        """
+        Moves the robot to a new position, usually the next cell of the current path.
+        :param node: New start node (tuple).
+        :return: None
+        """
+        self.start = node
+
+    def update(self, cells):
+        """
+        Repairs the plan after cells of the Board changed (obstacles added or removed).
+        :param cells: Iterable of nodes (tuples) whose occupancy changed.
+        :return: None
+        """
+        self._km += self.heuristic(self._last, self.start)
+        self._last = self.start
+        for i, j in cells:
+            self._update_vertex((i, j))
+            for di, dj in self.board.graph.directions:
+                self._update_vertex((i + di, j + dj))
+        self._compute()
+
+    def path(self):
+        """
+        Current shortest path from start to goal, following the repaired search.
+        Every step must lower g, so an inconsistent search raises instead of looping.
+        :return: List of nodes representing the path, or empty list if no path found.
+        """
+        g = self._g
+        if g.get(self.start, INF) == INF:
+            return []
+        graph = self.board.graph
+        edges = graph.edges
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            if len(path) > len(edges): # Longer than any simple path
+                raise RuntimeError("D* Lite search is inconsistent: the path does not reach the goal.")
+            down = [n for n in edges[current] if g.get(n, INF) < g[current]]
+            if not down:
+                raise RuntimeError(f"D* Lite search is inconsistent: no neighbour of {current} is closer to the goal.")
+            current = min(down, key=lambda n: g.get(n, INF) + graph.weight(current, n))
+            path.append(current)
+        return path
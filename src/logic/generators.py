@@ -0,0 +1,188 @@
+import numpy as np
+
+def random_obstacles(rows, cols, n, exclude=(), rng=None):
+    """
+    Picks n distinct random cells of a rows x cols Board in a single vectorized step.
+    :param rows: Number of rows of the Board.
+    :param cols: Number of columns of the Board.
+    :param n: Number of cells to pick.
+    :param exclude: Nodes (tuples) that must never be picked, e.g. initial and final positions.
+    :param rng: np.random.Generator or seed; a fresh Generator is used if None.
+    :return: Sorted array of flat cell ids (row * cols + col).
+    """
+    rng = np.random.default_rng(rng)
+    excluded = sorted({i * cols + j for i, j in exclude})
+    available = rows * cols - len(excluded)
+    if n < 0 or n > available:
+        raise ValueError(f"Cannot place {n} obstacles on {available} free cells.")
+    ids = rng.choice(available, size=n, replace=False)
+    for e in excluded: # Shift past each excluded cell, in ascending order
+        ids[ids >= e] += 1
+    ids.sort()
+    return ids
+
+def binary_tree_maze(rows, cols, rng=None):
+    """
+    Perfect maze drawn with the binary-tree algorithm in a single vectorized step.
+    Rooms are the cells with even row and column; every room opens the wall to its
+    north or to its west at random (only west on the first row, only north on the
+    first column), so every room is reachable from (0, 0) through exactly one path.
+    :param rows: Number of rows of the Board.
+    :param cols: Number of columns of the Board.
+    :param rng: np.random.Generator or seed; a fresh Generator is used if None.
+    :return: 2D np.int8 array with -1 for walls and 0 for free cells.
+    """
+    rng = np.random.default_rng(rng)
+    grid = np.full((rows, cols), -1, dtype=np.int8)
+    grid[::2, ::2] = 0 # Rooms
+    north = rng.random(grid[::2, ::2].shape) < 0.5
+    north[0, :] = False
+    north[1:, 0] = True
+    west = ~north
+    west[:, 0] = False
+    i, j = np.nonzero(north)
+    grid[2 * i - 1, 2 * j] = 0
+    i, j = np.nonzero(west)
+    grid[2 * i, 2 * j - 1] = 0
+    return grid
+
+def sidewinder_maze(rows, cols, rng=None):
+    """
+    Perfect maze drawn with the sidewinder algorithm, vectorized over the whole Board.
+    Rooms are the cells with even row and column. The first row is one open
+    corridor; every other row is cut into random runs of rooms joined east-west,
+    and each run opens the wall to its north from one random room. Unlike the
+    binary tree, the long corridor is only on the first row.
+    :param rows: Number of rows of the Board.
+    :param cols: Number of columns of the Board.
+    :param rng: np.random.Generator or seed; a fresh Generator is used if None.
+    :return: 2D np.int8 array with -1 for walls and 0 for free cells.
+    """
+    rng = np.random.default_rng(rng)
+    grid = np.full((rows, cols), -1, dtype=np.int8)
+    grid[::2, ::2] = 0 # Rooms
+    rooms_r, rooms_c = grid[::2, ::2].shape
+    grid[0, 1:2 * rooms_c - 2:2] = 0 # First row: one corridor
+    if rooms_r < 2:
+        return grid
+    close = rng.random((rooms_r - 1, rooms_c)) < 0.5 # Whether a run ends at this room
+    close[:, -1] = True
+    i, j = np.nonzero(~close)
+    grid[2 * i + 2, 2 * j + 1] = 0 # Join the rooms of each run
+    ends = np.flatnonzero(close)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    chosen = starts + (rng.random(len(starts)) * (ends - starts + 1)).astype(np.int64)
+    i, j = np.divmod(chosen, rooms_c)
+    grid[2 * i + 1, 2 * j] = 0 # One opening to the north per run
+    return grid
+
+def rooms_and_corridors(rows, cols, rng=None, block=16, loops=0.1):
+    """
+    Rectangular rooms joined by corridors, like a building floor.
+    The Board is split into blocks of about block x block cells, each holding one
+    room of random size. Every room is linked to the room of the block north or
+    west of it (a binary tree over the blocks, so all rooms are connected), and
+    the other link is added with probability loops. A link is an L-shaped
+    corridor between room centres that stays inside the two blocks.
+    :param rows: Number of rows of the Board (at least 3).
+    :param cols: Number of columns of the Board (at least 3).
+    :param rng: np.random.Generator or seed; a fresh Generator is used if None.
+    :param block: Side of the blocks, in cells.
+    :param loops: Probability of each extra link, which adds cycles.
+    :return: 2D np.int8 array with -1 for walls and 0 for free cells.
+    """
+    if rows < 3 or cols < 3:
+        raise ValueError("Rooms need a Board of at least 3 x 3 cells.")
+    rng = np.random.default_rng(rng)
+    grid = np.full((rows, cols), -1, dtype=np.int8)
+    blocks_r, blocks_c = max(1, rows // block), max(1, cols // block)
+    bh, bw = rows // blocks_r, cols // blocks_c
+    shape = (blocks_r, blocks_c)
+    # Rooms keep a one-cell margin inside their block
+    h = rng.integers(max(1, (bh - 2) // 2), bh - 1, size=shape)
+    w = rng.integers(max(1, (bw - 2) // 2), bw - 1, size=shape)
+    top = np.arange(blocks_r)[:, None] * bh + 1 + (rng.random(shape) * (bh - 1 - h)).astype(np.int64)
+    left = np.arange(blocks_c)[None, :] * bw + 1 + (rng.random(shape) * (bw - 1 - w)).astype(np.int64)
+    for t, l, hh, ww in zip(top.ravel().tolist(), left.ravel().tolist(), h.ravel().tolist(), w.ravel().tolist()):
+        grid[t:t + hh, l:l + ww] = 0
+    cr, cc = (top + h // 2).tolist(), (left + w // 2).tolist() # Room centres
+
+    north = rng.random(shape) < 0.5
+    north[0, :] = False
+    north[1:, 0] = True
+    west = ~north
+    west[:, 0] = False
+    north |= rng.random(shape) < loops
+    west |= rng.random(shape) < loops
+    north[0, :] = False
+    west[:, 0] = False
+    for i, j in zip(*np.nonzero(north)):
+        (ra, ca), (rb, cb) = (cr[i][j], cc[i][j]), (cr[i - 1][j], cc[i - 1][j])
+        grid[rb:ra + 1, ca] = 0
+        grid[rb, min(ca, cb):max(ca, cb) + 1] = 0
+    for i, j in zip(*np.nonzero(west)):
+        (ra, ca), (rb, cb) = (cr[i][j], cc[i][j]), (cr[i][j - 1], cc[i][j - 1])
+        grid[ra, cb:ca + 1] = 0
+        grid[min(ra, rb):max(ra, rb) + 1, cb] = 0
+    return grid
+
+def warehouse(rows, cols, rng=None, rack_length=10, aisle=2, cross_aisle=3, margin=2, missing=0.05):
+    """
+    Warehouse floor: double-deep racks in columns, separated by aisles, with cross
+    aisles between rack rows and an open margin around the floor.
+    Racks are laid out with modular arithmetic over the whole Board at once; the
+    random part is which racks are missing (open floor space).
+    :param rows: Number of rows of the Board.
+    :param cols: Number of columns of the Board.
+    :param rng: np.random.Generator or seed; a fresh Generator is used if None.
+    :param rack_length: Length of a rack, in cells.
+    :param aisle: Width of the aisles between racks.
+    :param cross_aisle: Width of the aisles that cross the racks.
+    :param margin: Width of the open border.
+    :param missing: Probability that a rack is missing.
+    :return: 2D np.int8 array with -1 for racks and 0 for free cells.
+    """
+    rng = np.random.default_rng(rng)
+    i = np.arange(rows)[:, None] - margin
+    j = np.arange(cols)[None, :] - margin
+    period_r, period_c = rack_length + cross_aisle, 2 + aisle
+    rack = (i % period_r < rack_length) & (j % period_c < 2)
+    rack &= (i >= 0) & (i < rows - 2 * margin) & (j >= 0) & (j < cols - 2 * margin)
+    present = rng.random((max(rows, 1) // period_r + 1, max(cols, 1) // period_c + 1)) >= missing
+    rack &= present[np.maximum(i, 0) // period_r, np.maximum(j, 0) // period_c]
+    return np.where(rack, -1, 0).astype(np.int8)
+
+def cave(rows, cols, rng=None, fill=0.45, steps=4):
+    """
+    Cave made by a cellular automaton: cells start as walls with probability fill,
+    then each step turns a cell into a wall when at least 5 of the 9 cells of its
+    3 x 3 neighbourhood are walls (outside the Board counts as wall). Every step
+    is a sum of 9 shifted copies of the Board.
+    Caves may have several disconnected pockets.
+    :param rows: Number of rows of the Board.
+    :param cols: Number of columns of the Board.
+    :param rng: np.random.Generator or seed; a fresh Generator is used if None.
+    :param fill: Initial wall probability.
+    :param steps: Number of smoothing steps.
+    :return: 2D np.int8 array with -1 for walls and 0 for free cells.
+    """
+    rng = np.random.default_rng(rng)
+    wall = np.ones((rows + 2, cols + 2), dtype=np.uint8)
+    wall[1:-1, 1:-1] = rng.random((rows, cols)) < fill
+    count = np.empty((rows, cols), dtype=np.uint8)
+    for _ in range(steps):
+        count.fill(0)
+        for di in range(3):
+            for dj in range(3):
+                count += wall[di:di + rows, dj:dj + cols]
+        wall[1:-1, 1:-1] = count >= 5
+    return np.where(wall[1:-1, 1:-1], -1, 0).astype(np.int8)
+
+# Structured layouts: each takes (rows, cols, rng) and returns an int8 grid (see Board.generate)
+LAYOUTS = {
+    "maze": binary_tree_maze,
+    "sidewinder": sidewinder_maze,
+    "rooms": rooms_and_corridors,
+    "warehouse": warehouse,
+    "cave": cave,
+}
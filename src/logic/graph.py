@@ -1,14 +1,60 @@
+import numpy as np
+
+from logic.grid import directions
+from logic.heuristics import SQRT2
+from logic.instrument import instrumented
+
 class Graph:
     """
     Class representing a Graph structure.
     Attributes:
-        nodes (list): List of nodes in the Graph.
-        edges (dict): Dictionary mapping each node to its list of connected nodes.
+        shape (tuple): Shape (rows, cols) of the Board the Graph was built from.
+        offsets (np.ndarray): CSR offsets; the neighbours of cell id k are neighbors[offsets[k]:offsets[k + 1]].
+        neighbors (np.ndarray): CSR neighbour cell ids (int32), where a cell id is row * cols + col.
+        costs (np.ndarray): Cost of entering each cell, or None when every move costs 1.
+        weights (np.ndarray): CSR edge weights, parallel to neighbors, or None when every move costs 1.
+        movement (str): "4" or "8"-connected moves.
+        corner_cutting (bool): Whether a diagonal move is allowed past one occupied corner cell.
+        directions (list): Moves (di, dj) of the movement model, orthogonal ones first.
+        nodes (list): List of nodes in the Graph, built from the CSR arrays on first access.
+        edges (dict): Dictionary mapping each node to its list of connected nodes, built on first access.
     """
 
     def __init__(self):
-        self.nodes = []
-        self.edges = {}
+        self.movement = "4"
+        self.corner_cutting = False
+        self.directions = directions("4") # Up, Down, Left, Right
+        self.shape = None
+        self.offsets = None
+        self.neighbors = None
+        self.costs = None
+        self.weights = None
+        self._free = None
+        self._nodes = []
+        self._edges = {}
+
+    @property
+    def nodes(self):
+        if self._nodes is None:
+            if self._edges is None:
+                self._expand()
+            else: # Patched Graph: edges are authoritative
+                self._nodes = list(self._edges)
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, value):
+        self._nodes = value
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            self._expand()
+        return self._edges
+
+    @edges.setter
+    def edges(self, value):
+        self._edges = value
 
     def display_graph(self):
         """
@@ -18,22 +64,169 @@ class Graph:
         for node in self.nodes:
             print(f"Node {node}: Edges -> {self.edges.get(node, [])}")
 
-    def build_from_board(self, board):
+    def weight(self, u, v):
+        """
+        Cost of moving from node u to its neighbour v: the cost of entering v,
+        times sqrt(2) for diagonal moves.
+        :param u: Source node (tuple).
+        :param v: Target node (tuple).
+        :return: Edge weight.
+        """
+        w = 1 if self.costs is None else self.costs[v].item()
+        if u[0] != v[0] and u[1] != v[1]: # Diagonal
+            return w * SQRT2
+        return w
+
+    def max_weight(self):
+        """
+        :return: Largest edge weight of the Graph.
+        """
+        w = 1 if self.costs is None else self.costs.max().item()
+        return w * SQRT2 if self.movement != "4" else w
+
+    @instrumented("graph.build")
+    def build_from_board(self, board, costs=None, movement="4", corner_cutting=False):
         """
         Builds the Graph from a given Board.
+        The adjacency masks of every direction are computed at once by comparing the
+        free-cell mask with shifted copies of itself, and stored as CSR arrays.
+        The nodes list and edges dict are only built if someone asks for them.
         :param board: 2D array representing the Board.
+        :param costs: Optional 2D array with the cost of entering each cell (>= 1).
+        :param movement: "4" or "8"-connected moves.
+        :param corner_cutting: Whether a diagonal move is allowed when one of the two cells beside it is occupied.
         :return: None
         """
+        board = np.asarray(board)
         r, c = board.shape
-        for i in range(r):
-            for j in range(c):
-                if board[i][j] == -1: # Occupied position
-                    pass
-                else:
-                    self.nodes.append( (i, j) ) # Add node
-                    self.edges[ (i, j) ] = [] # Init. edges for the node
-                    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)] # Up, Down, Left, Right
-                    for di, dj in directions:
-                        ni, nj = i + di, j + dj
-                        if 0 <= ni < r and 0 <= nj < c and board[ni][nj] != -1: # If the positions are valid
-                            self.edges[(i, j)].append((ni, nj))
+        free = board != -1 # Occupied positions have no edges
+        self.movement = movement
+        self.corner_cutting = corner_cutting
+        self.directions = directions(movement)
+
+        def shifted(di, dj): # shifted(di, dj)[i, j] is free[i + di, j + dj], False outside the Board
+            out = np.zeros((r, c), dtype=bool)
+            out[max(0, -di):r - max(0, di), max(0, -dj):c - max(0, dj)] = free[max(0, di):r - max(0, -di), max(0, dj):c - max(0, -dj)]
+            return out
+
+        masks = []
+        for di, dj in self.directions:
+            mask = free & shifted(di, dj)
+            if di and dj: # Diagonal: check the two cells beside the move
+                a, b = shifted(di, 0), shifted(0, dj)
+                mask &= (a | b) if corner_cutting else (a & b)
+            masks.append(mask)
+
+        counts = np.zeros(r * c, dtype=np.int64)
+        for mask in masks:
+            counts += mask.ravel()
+        offsets = np.zeros(r * c + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        # Fill each node's slice in direction order, so neighbours keep the Up, Down, Left, Right (then diagonal) order
+        neighbors = np.empty(offsets[-1], dtype=np.int32)
+        diagonal = np.zeros(offsets[-1], dtype=bool)
+        filled = np.zeros(r * c, dtype=np.int64)
+        for (di, dj), mask in zip(self.directions, masks):
+            ids = np.flatnonzero(mask)
+            slots = offsets[ids] + filled[ids]
+            neighbors[slots] = ids + di * c + dj
+            diagonal[slots] = bool(di and dj)
+            filled[ids] += 1
+
+        self.shape = (r, c)
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.costs = None if costs is None else np.asarray(costs)
+        if costs is None and movement == "4":
+            self.weights = None
+        else:
+            self.weights = np.ones(len(neighbors)) if costs is None else self.costs.ravel()[neighbors]
+            if movement != "4":
+                self.weights = np.where(diagonal, self.weights * SQRT2, self.weights)
+        self._free = free.ravel()
+        self._nodes = None
+        self._edges = None
+
+    def block(self, node):
+        """
+        Removes a node and every edge touching it, patching only the affected entries.
+        The CSR arrays no longer describe the Graph afterwards and are dropped.
+        :param node: Node (tuple) that became occupied.
+        :return: True if the node was in the Graph, False otherwise.
+        """
+        edges = self.edges
+        if node not in edges:
+            return False
+        del edges[node]
+        self._relink_around(node)
+        self._drop_csr()
+        return True
+
+    def unblock(self, node):
+        """
+        Adds a node back, connecting it to its free neighbours in the usual
+        direction order, patching only the affected entries.
+        The CSR arrays no longer describe the Graph afterwards and are dropped.
+        :param node: Node (tuple) that became free.
+        :return: True if the node was added, False if it was already in the Graph.
+        """
+        edges = self.edges
+        if node in edges:
+            return False
+        edges[node] = []
+        self._relink(node)
+        self._relink_around(node)
+        self._drop_csr()
+        return True
+
+    def _relink_around(self, node):
+        """
+        Recomputes the edges of every free neighbour of node (including diagonal
+        ones, whose moves may pass beside node).
+        :return: None
+        """
+        i, j = node
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                if (di or dj) and (i + di, j + dj) in self._edges:
+                    self._relink((i + di, j + dj))
+
+    def _relink(self, node):
+        """
+        Recomputes the edge list of a free node from its free neighbours, in direction order.
+        :return: None
+        """
+        edges = self._edges
+        i, j = node
+        linked = []
+        for di, dj in self.directions:
+            neighbor = (i + di, j + dj)
+            if neighbor not in edges:
+                continue
+            if di and dj: # Diagonal: check the two cells beside the move
+                beside = ((i + di, j) in edges) + ((i, j + dj) in edges)
+                if beside < (1 if self.corner_cutting else 2):
+                    continue
+            linked.append(neighbor)
+        edges[node] = linked
+
+    def _drop_csr(self):
+        self.offsets = None
+        self.neighbors = None
+        self.weights = None
+        self._free = None
+        self._nodes = None
+
+    def _expand(self):
+        """
+        Builds the nodes list and edges dict from the CSR arrays.
+        :return: None
+        """
+        c = self.shape[1]
+        ids = np.flatnonzero(self._free)
+        self._nodes = list(zip(*(a.tolist() for a in np.divmod(ids, c))))
+        targets = list(zip(*(a.tolist() for a in np.divmod(self.neighbors, c))))
+        starts = self.offsets[ids].tolist()
+        ends = self.offsets[ids + 1].tolist()
+        self._edges = {node: targets[a:b] for node, a, b in zip(self._nodes, starts, ends)}
@@ -0,0 +1,110 @@
+import numpy as np
+
+OBSTACLE = -1
+
+# Movement models: 4-connected, 8-connected, and 8-connected followed by line-of-sight smoothing
+MOVEMENTS = ("4", "8", "any-angle")
+ORTHOGONAL = [(-1, 0), (1, 0), (0, -1), (0, 1)] # Up, Down, Left, Right
+DIAGONAL = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+def directions(movement="4"):
+    """
+    Moves (di, dj) allowed by a movement model, orthogonal ones first.
+    :param movement: One of MOVEMENTS.
+    :return: List of (di, dj) tuples.
+    """
+    if movement not in MOVEMENTS:
+        raise ValueError(f"Unknown movement model '{movement}'. Choose one of: {', '.join(MOVEMENTS)}")
+    return ORTHOGONAL + (DIAGONAL if movement != "4" else [])
+
+def as_array(board):
+    """
+    Returns the raw 2D array behind a Board, a DataFrame or an array-like.
+    :param board: Board object, DataFrame or 2D array.
+    :return: 2D NumPy array (no copy when possible).
+    """
+    if hasattr(board, "grid"): # Board object
+        board = board.grid
+    if hasattr(board, "values"): # DataFrame
+        board = board.values
+    return np.asarray(board)
+
+class PaddedGrid:
+    """
+    Flat view of a Board used by the array-backed searches.
+    The grid is surrounded by a one-cell blocked border so that neighbour
+    offsets can be applied to any free cell without bound checks.
+    A diagonal move needs both cells beside it free, or at least one of them
+    when corner cutting is allowed.
+    Attributes:
+        rows (int): Number of rows of the original Board.
+        cols (int): Number of columns of the original Board.
+        width (int): Row stride of the padded grid (cols + 2).
+        size (int): Number of cells of the padded grid.
+        free (bytearray): 1 for free cells, 0 for obstacles and the border.
+        offsets (list): Flat offsets for Up, Down, Left, Right.
+        diagonal (bool): Whether diagonal moves are allowed.
+        moves (list): (offset, corner, corner) per allowed move; orthogonal moves have corners 0.
+        corners (int): Number of free corner cells a diagonal move needs (2, or 1 with corner cutting).
+    """
+
+    def __init__(self, board, movement=None, corner_cutting=None):
+        if movement is None: # Take the movement model from the Board, if any
+            movement = getattr(board, "movement", "4")
+        if corner_cutting is None:
+            corner_cutting = getattr(board, "corner_cutting", False)
+        arr = as_array(board)
+        self.rows, self.cols = arr.shape
+        self.width = self.cols + 2
+        self.size = (self.rows + 2) * self.width
+        # The mask (one byte per cell) is written straight into the bytearray, with no int8 copy of the Board in between
+        self.free = bytearray(self.size)
+        padded = np.frombuffer(self.free, dtype=np.bool_).reshape(self.rows + 2, self.width)
+        np.not_equal(arr, OBSTACLE, out=padded[1:-1, 1:-1])
+        self.offsets = [-self.width, self.width, -1, 1] # Up, Down, Left, Right
+        self.diagonal = movement != "4"
+        self.moves = [(off, 0, 0) for off in self.offsets]
+        self.moves += [(di * self.width + dj, di * self.width, dj) for di, dj in directions(movement)[4:]]
+        self.corners = 1 if corner_cutting else 2
+
+    def index(self, node):
+        """
+        Converts a (row, col) node into its flat padded index.
+        :param node: Node (tuple).
+        :return: Flat index (int).
+        """
+        return (node[0] + 1) * self.width + node[1] + 1
+
+    def node(self, index):
+        """
+        Converts a flat padded index back into a (row, col) node.
+        :param index: Flat index (int).
+        :return: Node (tuple).
+        """
+        r, c = divmod(index, self.width)
+        return (r - 1, c - 1)
+
+    def inside(self, node):
+        """
+        Checks whether a node lies inside the Board.
+        :param node: Node (tuple).
+        :return: True if the node is inside the Board, False otherwise.
+        """
+        return 0 <= node[0] < self.rows and 0 <= node[1] < self.cols
+
+    def trace(self, parent, index):
+        """
+        Rebuilds the path ending at index by following a parent array.
+        The root of the tree is the index whose parent is itself.
+        :param parent: Parent array indexed by flat padded indices.
+        :param index: Flat index where the path ends.
+        :return: List of nodes from the root to index.
+        """
+        path = []
+        while True:
+            path.append(self.node(index))
+            up = parent[index]
+            if up == index:
+                break
+            index = up
+        return path[::-1]
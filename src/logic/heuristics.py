@@ -0,0 +1,38 @@
+import math
+
+SQRT2 = math.sqrt(2)
+
+def manhattan(a, b):
+    """
+    Manhattan distance, exact on an open 4-connected Board.
+    :param a: First node (tuple).
+    :param b: Second node (tuple).
+    :return: Distance between a and b.
+    """
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def octile(a, b):
+    """
+    Octile distance, exact on an open 8-connected Board with diagonal cost sqrt(2).
+    :param a: First node (tuple).
+    :param b: Second node (tuple).
+    :return: Distance between a and b.
+    """
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+def euclidean(a, b):
+    """
+    Straight-line distance, a lower bound for any movement model.
+    :param a: First node (tuple).
+    :param b: Second node (tuple).
+    :return: Distance between a and b.
+    """
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "octile": octile,
+    "euclidean": euclidean,
+}
@@ -0,0 +1,390 @@
+import heapq
+from array import array
+from itertools import count
+
+import numpy as np
+
+from logic.bfs import bfs_tree
+from logic.grid import OBSTACLE, PaddedGrid, as_array
+from logic.heuristics import SQRT2, manhattan, octile
+from logic.instrument import instrumented
+
+# Openings at least this wide get an entrance at each end instead of one in the middle
+WIDE_OPENING = 6
+
+def _openings(both, k):
+    """
+    Maximal runs of True along each row of both, cut every k cells (at cluster boundaries).
+    :param both: 2D bool array, one row per cluster border line.
+    :param k: Cluster size along the rows.
+    :return: (line, first, last) arrays with one entry per run.
+    """
+    cut = np.zeros(both.shape[1], dtype=bool)
+    cut[::k] = True # First cell of each cluster
+    first = both.copy()
+    first[:, 1:] &= ~both[:, :-1] | cut[1:]
+    last = both.copy()
+    last[:, :-1] &= ~both[:, 1:] | cut[1:]
+    line, a = np.nonzero(first)
+    _, b = np.nonzero(last)
+    return line, a, b
+
+def _crossings(both, k):
+    """
+    Cells where the abstract graph crosses a border: the middle of every opening,
+    or both ends of a wide one.
+    :return: (line, position) arrays.
+    """
+    line, a, b = _openings(both, k)
+    wide = b - a + 1 >= WIDE_OPENING
+    return (np.concatenate([line, line[wide]]),
+            np.concatenate([np.where(wide, a, (a + b) // 2), b[wide]]))
+
+def _cluster_tree(grid, source):
+    """
+    Shortest-path tree from source inside one cluster: bfs_tree with 4-connected
+    moves, Dijkstra with sqrt(2) diagonals otherwise.
+    :param grid: PaddedGrid of the cluster.
+    :param source: Source node (tuple), local to the cluster.
+    :return: (parent, dist) arrays indexed by flat padded index, -1 where unreached.
+    """
+    if not grid.diagonal:
+        return bfs_tree(grid, source)
+    free, moves, corners = grid.free, grid.moves, grid.corners
+    parent = array('i', [-1]) * grid.size
+    dist = array('d', [-1.0]) * grid.size
+    done = bytearray(grid.size)
+    s = grid.index(source)
+    parent[s] = s
+    dist[s] = 0.0
+    heap = [(0.0, s)]
+    while heap:
+        d, current = heapq.heappop(heap)
+        if done[current]: # Stale entry
+            continue
+        done[current] = 1
+        for off, a, b in moves:
+            neighbor = current + off
+            if free[neighbor] and not done[neighbor] and (not a or free[current + a] + free[current + b] >= corners):
+                nd = d + (SQRT2 if a else 1)
+                if parent[neighbor] < 0 or nd < dist[neighbor]:
+                    parent[neighbor] = current
+                    dist[neighbor] = nd
+                    heapq.heappush(heap, (nd, neighbor))
+    return parent, dist
+
+class HierarchicalPlanner:
+    """
+    Hierarchical path planner (HPA*) for large Boards.
+    The Board is split into square clusters. Every opening in a border between two
+    clusters gets one entrance pair (two if it is wide), and the abstract graph links
+    entrances across borders (one move) and inside each cluster (length of the
+    shortest path that stays in the cluster). A query joins start and goal to the
+    entrances of their clusters, runs A* on the abstract graph and refines each
+    abstract edge with a search inside a single cluster.
+    Intra-cluster distances are computed the first time a query reaches a cluster
+    (or all at once with precompute()) and kept until update() reports a change in
+    that cluster; only the borders the changed cells lie on are rebuilt.
+    Paths follow the Board's movement model (diagonals cost sqrt(2)) and ignore its
+    cost map. They are near-optimal: every abstract edge stays inside one cluster.
+    Usage:
+        planner = HierarchicalPlanner(board)
+        path = planner.path(start, goal)
+        board.add_obstacle(x, y)
+        planner.update([(x, y)])
+    Board.hierarchy keeps a planner that the Board updates itself.
+    Attributes:
+        board (Board): Board being planned on.
+        cluster_size (int): Side of the square clusters, in cells.
+        shape (tuple): Number of rows and columns of the Board.
+        clusters (tuple): Number of cluster rows and columns.
+    """
+
+    def __init__(self, board, cluster_size=16):
+        if cluster_size < 2:
+            raise ValueError("Clusters must be at least 2 cells wide.")
+        self.board = board
+        self.cluster_size = cluster_size
+        self.movement = getattr(board, "movement", "4")
+        self.corner_cutting = getattr(board, "corner_cutting", False)
+        self._heuristic = manhattan if self.movement == "4" else octile
+        rows, cols = as_array(board).shape
+        self.shape = (rows, cols)
+        self.clusters = (-(-rows // cluster_size), -(-cols // cluster_size))
+        self._borders = {} # (cluster, cluster) -> list of (cell, cell) crossings, cells as flat ids
+        self._links = {} # cell -> cells across a border
+        self._entrances = {} # cluster -> entrance cells
+        self._intra = {} # cluster -> {entrance: [(entrance, distance)]}
+        self._segments = {} # cluster -> {(entrance, entrance): cells}
+        self._build()
+
+    @instrumented("hierarchy.build")
+    def _build(self):
+        """
+        Finds the crossings of every border at once with NumPy.
+        :return: None
+        """
+        k = self.cluster_size
+        rows, cols = self.shape
+        per_row = self.clusters[1]
+        free = as_array(self.board) != OBSTACLE
+        xs = np.arange(k - 1, cols - 1, k) # Last column before each vertical border
+        line, pos = _crossings((free[:, xs] & free[:, xs + 1]).T, k)
+        a = pos * cols + xs[line]
+        ca = (pos // k) * per_row + line
+        vertical = (a, a + 1, ca, ca + 1)
+        ys = np.arange(k - 1, rows - 1, k) # Last row before each horizontal border
+        line, pos = _crossings(free[ys, :] & free[ys + 1, :], k)
+        a = ys[line] * cols + pos
+        ca = line * per_row + pos // k
+        horizontal = (a, a + cols, ca, ca + per_row)
+
+        for a, b, ca, cb in (vertical, horizontal):
+            for u, v, cu, cv in zip(a.tolist(), b.tolist(), ca.tolist(), cb.tolist()):
+                self._borders.setdefault((cu, cv), []).append((u, v))
+                self._links.setdefault(u, []).append(v)
+                self._links.setdefault(v, []).append(u)
+                self._entrances.setdefault(cu, set()).add(u)
+                self._entrances.setdefault(cv, set()).add(v)
+        self._entrances = {c: sorted(cells) for c, cells in self._entrances.items()}
+
+    def _cluster(self, cell):
+        r, c = divmod(cell, self.shape[1])
+        return (r // self.cluster_size) * self.clusters[1] + c // self.cluster_size
+
+    def _bounds(self, cluster):
+        k = self.cluster_size
+        r0, c0 = (cluster // self.clusters[1]) * k, (cluster % self.clusters[1]) * k
+        return r0, c0, min(r0 + k, self.shape[0]), min(c0 + k, self.shape[1])
+
+    def _local_grid(self, cluster):
+        """
+        PaddedGrid of a single cluster: cells outside it count as blocked.
+        :return: (grid, row offset, column offset)
+        """
+        r0, c0, r1, c1 = self._bounds(cluster)
+        grid = PaddedGrid(as_array(self.board)[r0:r1, c0:c1], self.movement, self.corner_cutting)
+        return grid, r0, c0
+
+    def _tree(self, cluster, cell):
+        """
+        Shortest-path tree from cell inside its cluster.
+        :return: Function mapping a cell of the cluster to its distance (-1 if unreached),
+                 and a function tracing the path from cell to another one as nodes.
+        """
+        grid, r0, c0 = self._local_grid(cluster)
+        cols = self.shape[1]
+        r, c = divmod(cell, cols)
+        parent, dist = _cluster_tree(grid, (r - r0, c - c0))
+        local = lambda other: grid.index((other // cols - r0, other % cols - c0))
+        trace = lambda other: [(i + r0, j + c0) for i, j in grid.trace(parent, local(other))]
+        return (lambda other: dist[local(other)]), trace
+
+    def _cluster_edges(self, cluster):
+        """
+        Intra-cluster edges between the entrances of a cluster, computed on first use.
+        :return: Dict entrance -> list of (entrance, distance).
+        """
+        edges = self._intra.get(cluster)
+        if edges is None:
+            edges = {}
+            entrances = self._entrances.get(cluster, [])
+            for u in entrances:
+                distance, _ = self._tree(cluster, u)
+                edges[u] = [(v, distance(v)) for v in entrances if v != u]
+                edges[u] = [(v, d) for v, d in edges[u] if d >= 0]
+            self._intra[cluster] = edges
+        return edges
+
+    def precompute(self):
+        """
+        Computes the intra-cluster distances of every cluster up front.
+        :return: None
+        """
+        for cluster in range(self.clusters[0] * self.clusters[1]):
+            self._cluster_edges(cluster)
+
+    def _attach(self, cell, target=None):
+        """
+        Joins a cell that is not (necessarily) an entrance to the abstract graph.
+        :param cell: Flat id of the cell.
+        :param target: Flat id of another cell in the same cluster, linked directly if reachable.
+        :return: (list of (cell, distance), trace function of the cell's tree)
+        """
+        cluster = self._cluster(cell)
+        distance, trace = self._tree(cluster, cell)
+        others = self._entrances.get(cluster, []) + ([target] if target is not None else [])
+        edges = [(v, distance(v)) for v in others if v != cell]
+        return [(v, d) for v, d in edges if d >= 0], trace
+
+    def _segment(self, cluster, u, v):
+        """
+        Cells of the intra-cluster path between two entrances, cached per cluster.
+        :return: List of nodes from u to v.
+        """
+        cache = self._segments.setdefault(cluster, {})
+        if (u, v) not in cache:
+            _, trace = self._tree(cluster, u)
+            cache[(u, v)] = trace(v)
+        return cache[(u, v)]
+
+    def path(self, start, goal, stats=None):
+        """
+        Finds a path from start to goal through the abstract graph.
+        :param start: Starting node (tuple).
+        :param goal: Goal node (tuple).
+        :param stats: Optional dict, receives the number of expanded abstract nodes "expanded"
+                      and the open list's high-water mark "queue_peak".
+        :return: List of nodes representing the path from start to goal, or empty list if no path found.
+        """
+        rows, cols = self.shape
+        arr = as_array(self.board)
+        path = []
+        expanded = peak = 0
+        inside = lambda node: 0 <= node[0] < rows and 0 <= node[1] < cols
+        if inside(start) and inside(goal) and arr[start] != OBSTACLE and arr[goal] != OBSTACLE:
+            if start == goal:
+                path = [start]
+            elif not hasattr(self.board, "components") or self.board.components.connected(start, goal):
+                path, expanded, peak = self._search(start, goal)
+
+        if stats is not None:
+            stats["expanded"] = expanded
+            stats["queue_peak"] = peak
+        return path
+
+    def _search(self, start, goal):
+        """
+        A* on the abstract graph, then refinement of every abstract edge.
+        :return: (path, number of expanded abstract nodes, open list high-water mark)
+        """
+        cols = self.shape[1]
+        s, g = start[0] * cols + start[1], goal[0] * cols + goal[1]
+        same = self._cluster(s) == self._cluster(g)
+        out, trace_start = self._attach(s, g if same else None)
+        into, trace_goal = self._attach(g)
+        into = dict(into)
+
+        node = lambda cell: divmod(cell, cols)
+        heuristic = self._heuristic
+        tie = count()
+        h = heuristic(start, goal)
+        heap = [(h, h, next(tie), s)]
+        g_score = {s: 0}
+        parent = {s: None}
+        closed = set()
+        expanded = 0
+        peak = 0
+        abstract = []
+        while heap: # While there are abstract nodes to explore
+            if len(heap) > peak:
+                peak = len(heap)
+            _, _, _, current = heapq.heappop(heap)
+            if current in closed: # Stale entry
+                continue
+            if current == g: # Abstract path from s to g
+                while current is not None:
+                    abstract.append(current)
+                    current = parent[current]
+                abstract.reverse()
+                break
+            closed.add(current)
+            expanded += 1
+            if current == s:
+                edges = list(out)
+            else:
+                edges = list(self._cluster_edges(self._cluster(current)).get(current, []))
+                if current in into:
+                    edges.append((g, into[current]))
+            edges.extend((v, 1) for v in self._links.get(current, []))
+            for neighbor, d in edges:
+                score = g_score[current] + d
+                if neighbor not in closed and score < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = score
+                    parent[neighbor] = current
+                    h = heuristic(node(neighbor), goal)
+                    heapq.heappush(heap, (score + h, h, next(tie), neighbor))
+        if not abstract:
+            return [], expanded, peak
+
+        path = [start]
+        for u, v in zip(abstract, abstract[1:]):
+            cluster = self._cluster(u)
+            if cluster != self._cluster(v): # Step across a border
+                path.append(node(v))
+            elif u == s:
+                path.extend(trace_start(v)[1:])
+            elif v == g: # The goal's tree runs backwards; moves are symmetric
+                path.extend(trace_goal(u)[-2::-1])
+            else:
+                path.extend(self._segment(cluster, u, v)[1:])
+        return path, expanded, peak
+
+    def update(self, cells):
+        """
+        Rebuilds the abstraction around cells whose state changed.
+        The clusters holding the cells lose their intra-cluster distances, and the
+        crossings of every border the cells lie on are recomputed.
+        :param cells: Iterable of changed nodes (tuples).
+        :return: None
+        """
+        k = self.cluster_size
+        rows, cols = self.shape
+        per_row = self.clusters[1]
+        borders = set()
+        for r, c in cells:
+            cluster = self._cluster(r * cols + c)
+            self._drop(cluster)
+            if c % k == k - 1 and c + 1 < cols:
+                borders.add((cluster, cluster + 1))
+            if c % k == 0 and c > 0:
+                borders.add((cluster - 1, cluster))
+            if r % k == k - 1 and r + 1 < rows:
+                borders.add((cluster, cluster + per_row))
+            if r % k == 0 and r > 0:
+                borders.add((cluster - per_row, cluster))
+        for key in borders:
+            self._rebuild_border(*key)
+
+    def _drop(self, cluster):
+        self._intra.pop(cluster, None)
+        self._segments.pop(cluster, None)
+
+    def _rebuild_border(self, ca, cb):
+        """
+        Recomputes the crossings of the border between clusters ca and cb (ca < cb)
+        and the entrances of both clusters.
+        :return: None
+        """
+        for u, v in self._borders.pop((ca, cb), []):
+            self._links[u].remove(v)
+            self._links[v].remove(u)
+            for cell in (u, v):
+                if not self._links[cell]:
+                    del self._links[cell]
+
+        cols = self.shape[1]
+        free = as_array(self.board) != OBSTACLE
+        r0, c0, r1, c1 = self._bounds(ca)
+        if cb == ca + 1 and self.clusters[1] > 1: # Vertical border after column c1 - 1
+            both = free[r0:r1, c1 - 1] & free[r0:r1, c1]
+            _, pos = _crossings(both[None, :], both.size)
+            crossings = [((r0 + p) * cols + c1 - 1, (r0 + p) * cols + c1) for p in pos.tolist()]
+        else: # Horizontal border after row r1 - 1
+            both = free[r1 - 1, c0:c1] & free[r1, c0:c1]
+            _, pos = _crossings(both[None, :], both.size)
+            crossings = [((r1 - 1) * cols + c0 + p, r1 * cols + c0 + p) for p in pos.tolist()]
+        if crossings:
+            self._borders[(ca, cb)] = crossings
+        for u, v in crossings:
+            self._links.setdefault(u, []).append(v)
+            self._links.setdefault(v, []).append(u)
+
+        per_row = self.clusters[1]
+        for cluster in (ca, cb):
+            cells = set()
+            for key, side in (((cluster - 1, cluster), 1), ((cluster, cluster + 1), 0),
+                              ((cluster - per_row, cluster), 1), ((cluster, cluster + per_row), 0)):
+                cells.update(pair[side] for pair in self._borders.get(key, []))
+            self._entrances[cluster] = sorted(cells)
+            self._drop(cluster)
@@ -0,0 +1,148 @@
+import functools
+import io
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_active = None # Stats being recorded, or None when instrumentation is off
+
+class _NullStage:
+    """
+    Shared no-op context manager returned by stage() while nothing is recorded.
+    """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+def stage(name):
+    """
+    Times a block of code as one stage of the current recording.
+    While nothing is recorded it returns a shared no-op, so the cost is one call.
+    Usage:
+        with stage("graph.build"):
+            ...
+    :param name: Name of the stage.
+    :return: Context manager.
+    """
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+def instrumented(name):
+    """
+    Decorator that records every call of a function as a stage of the current recording.
+    :param name: Name of the stage.
+    :return: Decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class Stats(dict):
+    """
+    Measurements of one instrumented run.
+    As a dict it receives the search counters (e.g. "expanded", "queue_peak", "cost",
+    "path_length"), so it can be passed as the stats argument of any search.
+    Stages are recorded while it is the active recording (see recording()).
+    Attributes:
+        stages (dict): Stage name -> {"calls", "time_ms"} plus "peak_kb" when memory is traced.
+        memory (bool): Whether peak memory is traced with tracemalloc.
+        profile (pstats.Stats): cProfile results of the whole recording, or None.
+    """
+
+    def __init__(self, memory=False):
+        super().__init__()
+        self.stages = {}
+        self.memory = memory
+        self.profile = None
+        self._open = [] # [start bytes, peak bytes] of the stages being timed, innermost last
+
+    @contextmanager
+    def stage(self, name):
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open: # Keep the enclosing stage's peak before resetting it
+                self._open[-1][1] = max(self._open[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._open.append([current, current])
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            record = self.stages.setdefault(name, {"calls": 0, "time_ms": 0.0})
+            record["calls"] += 1
+            record["time_ms"] += elapsed * 1000
+            if self.memory:
+                mark = self._open.pop()
+                peak = max(mark[1], tracemalloc.get_traced_memory()[1])
+                record["peak_kb"] = max(record.get("peak_kb", 0.0), (peak - mark[0]) / 1024)
+                if self._open:
+                    self._open[-1][1] = max(self._open[-1][1], peak)
+
+    def report(self, top=15):
+        """
+        Formats the stages, the search counters and (if captured) the top of the profile.
+        :param top: Number of profile entries to include.
+        :return: Multi-line string.
+        """
+        lines = [f"{'stage':<24}{'calls':>7}{'time_ms':>12}" + (f"{'peak_kb':>12}" if self.memory else "")]
+        for name, record in self.stages.items():
+            line = f"{name:<24}{record['calls']:>7}{record['time_ms']:>12.3f}"
+            if self.memory:
+                line += f"{record.get('peak_kb', 0.0):>12.1f}"
+            lines.append(line)
+        lines.extend(f"{key}: {value}" for key, value in self.items())
+        if self.profile is not None:
+            out = io.StringIO()
+            self.profile.stream = out
+            self.profile.sort_stats("cumulative").print_stats(top)
+            lines.append(out.getvalue())
+        return "\n".join(lines)
+
+@contextmanager
+def recording(memory=False, profile=False):
+    """
+    Records every instrumented stage run inside the block.
+    Only one recording is active at a time; a nested one takes over until it ends.
+    Usage:
+        with recording(memory=True) as stats:
+            board = Board(...)
+            path = solve(board, "bfs", stats)
+        print(stats.report())
+    :param memory: Whether to trace peak memory per stage with tracemalloc (slows allocations down).
+    :param profile: Whether to capture a cProfile of the whole block into stats.profile.
+    :return: Context manager yielding the Stats object.
+    """
+    global _active
+    stats = Stats(memory)
+    previous, _active = _active, stats
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    profiler = None
+    if profile: # Profiling modules are only loaded when asked for
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield stats
+    finally:
+        if profiler is not None:
+            import pstats
+            profiler.disable()
+            stats.profile = pstats.Stats(profiler)
+        if started:
+            tracemalloc.stop()
+        _active = previous
@@ -0,0 +1,226 @@
+import heapq
+from itertools import count
+
+from logic.grid import PaddedGrid
+from logic.heuristics import SQRT2
+
+def jps(board, start, goal, diagonal=None, stats=None):
+    """
+    Perform Jump Point Search (JPS) on the Board's array from start to goal.
+    Straight runs of symmetric cells are skipped by jumping until a cell with a
+    forced neighbour (or the goal) is found, so only jump points enter the open list.
+    With diagonal=False moves are 4-connected and the path has the same length as bfs.
+    With diagonal=True diagonal moves cost sqrt(2) and are only allowed when both
+    adjacent orthogonal cells are free (no corner cutting).
+    By default the Board's movement model decides; corner cutting is not supported.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param diagonal: Whether to allow diagonal moves; taken from the Board if None.
+    :param stats: Optional dict, receives the number of expanded jump points "expanded" and the open list's high-water mark "queue_peak".
+    :return: List of nodes representing the path from start to goal, or empty list if no path found.
+    """
+    if diagonal is None:
+        if getattr(board, "corner_cutting", False) and getattr(board, "movement", "4") != "4":
+            raise ValueError("Jump Point Search does not support corner cutting.")
+        diagonal = getattr(board, "movement", "4") != "4"
+    grid = PaddedGrid(board)
+    path = []
+    expanded = peak = 0
+    if grid.inside(start) and grid.inside(goal):
+        search = _JumpSearch(grid, grid.index(goal), diagonal)
+        s = grid.index(start)
+        if s == search.goal:
+            path = [start]
+        elif grid.free[s] and grid.free[search.goal]:
+            jump_points, expanded, peak = search.run(s)
+            path = _expand(grid, jump_points)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["queue_peak"] = peak
+    return path
+
+def _sign(v):
+    return (v > 0) - (v < 0)
+
+def _expand(grid, jump_points):
+    """
+    Fills in the cells between consecutive jump points (straight or diagonal runs).
+    :param grid: PaddedGrid the search ran on.
+    :param jump_points: List of flat indices from start to goal.
+    :return: List of nodes.
+    """
+    if not jump_points:
+        return []
+    path = [grid.node(jump_points[0])]
+    for a, b in zip(jump_points, jump_points[1:]):
+        (ra, ca), (rb, cb) = grid.node(a), grid.node(b)
+        dr, dc = _sign(rb - ra), _sign(cb - ca)
+        for k in range(1, max(abs(rb - ra), abs(cb - ca)) + 1):
+            path.append((ra + k * dr, ca + k * dc))
+    return path
+
+class _JumpSearch:
+    """
+    A* over jump points on a PaddedGrid, with flat indices as nodes.
+    """
+
+    def __init__(self, grid, goal, diagonal):
+        self.grid = grid
+        self.free = grid.free
+        self.width = grid.width
+        self.goal = goal
+        self.goal_node = grid.node(goal)
+        self.diagonal = diagonal
+
+    def heuristic(self, index):
+        r, c = self.grid.node(index)
+        dr, dc = abs(r - self.goal_node[0]), abs(c - self.goal_node[1])
+        if self.diagonal:
+            return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+        return dr + dc
+
+    def run(self, start):
+        """
+        :param start: Flat index of the start cell.
+        :return: (list of jump points from start to goal or empty list, number of expanded jump points,
+                  open list high-water mark)
+        """
+        tie = count()
+        h = self.heuristic(start)
+        heap = [(h, h, next(tie), start)]
+        g_score = {start: 0}
+        parent = {start: None}
+        closed = set()
+        expanded = 0
+        peak = 0
+        while heap: # While there are jump points to explore
+            if len(heap) > peak:
+                peak = len(heap)
+            _, _, _, current = heapq.heappop(heap)
+            if current in closed: # Stale entry
+                continue
+            if current == self.goal:
+                points = []
+                while current is not None:
+                    points.append(current)
+                    current = parent[current]
+                return points[::-1], expanded, peak
+
+            closed.add(current)
+            expanded += 1
+            r, c = divmod(current, self.width)
+            for dr, dc in self._directions(current, parent[current]):
+                point = self._jump(current, dr, dc)
+                if point < 0 or point in closed:
+                    continue
+                pr, pc = divmod(point, self.width)
+                steps = max(abs(pr - r), abs(pc - c))
+                g = g_score[current] + (steps * SQRT2 if dr and dc else steps)
+                if g < g_score.get(point, float('inf')):
+                    g_score[point] = g
+                    parent[point] = current
+                    h = self.heuristic(point)
+                    heapq.heappush(heap, (g + h, h, next(tie), point))
+
+        return [], expanded, peak
+
+    def _directions(self, current, came_from):
+        """
+        Pruned set of directions (dr, dc) to jump towards from current.
+        :return: List of (dr, dc) tuples.
+        """
+        free, w = self.free, self.width
+        if came_from is None: # Start cell: every direction
+            dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            if self.diagonal:
+                dirs += [(dr, dc) for dr in (-1, 1) for dc in (-1, 1)
+                         if free[current + dr * w] and free[current + dc]]
+            return dirs
+
+        r, c = divmod(current, w)
+        pr, pc = divmod(came_from, w)
+        dr, dc = _sign(r - pr), _sign(c - pc)
+        if not self.diagonal: # Keep going and turn to both sides
+            if dc:
+                return [(-1, 0), (1, 0), (0, dc)]
+            return [(0, -1), (0, 1), (dr, 0)]
+
+        dirs = []
+        if dr and dc: # Diagonal: both components and the diagonal itself
+            vertical, horizontal = free[current + dr * w], free[current + dc]
+            if vertical:
+                dirs.append((dr, 0))
+            if horizontal:
+                dirs.append((0, dc))
+            if vertical and horizontal:
+                dirs.append((dr, dc))
+        elif dc: # Horizontal: forward, both sides and the diagonals between them
+            forward = free[current + dc]
+            for side in (-1, 1):
+                if free[current + side * w]:
+                    dirs.append((side, 0))
+                    if forward:
+                        dirs.append((side, dc))
+            if forward:
+                dirs.append((0, dc))
+        else: # Vertical
+            forward = free[current + dr * w]
+            for side in (-1, 1):
+                if free[current + side]:
+                    dirs.append((0, side))
+                    if forward:
+                        dirs.append((dr, side))
+            if forward:
+                dirs.append((dr, 0))
+        return dirs
+
+    def _jump(self, current, dr, dc):
+        """
+        Moves from current towards (dr, dc) until a jump point is found.
+        :return: Flat index of the jump point, or -1 if the run hits an obstacle.
+        """
+        if dr and dc:
+            return self._jump_diagonal(current, dr, dc)
+        if dc:
+            return self._jump_horizontal(current + dc, dc)
+        return self._jump_vertical(current + dr * self.width, dr * self.width)
+
+    def _jump_horizontal(self, index, step):
+        free, w, goal = self.free, self.width, self.goal
+        while free[index]:
+            if index == goal:
+                return index
+            # Forced neighbour: a side cell that is only reachable through this cell
+            if (free[index - w] and not free[index - w - step]) or (free[index + w] and not free[index + w - step]):
+                return index
+            index += step
+        return -1
+
+    def _jump_vertical(self, index, step):
+        free, goal = self.free, self.goal
+        while free[index]:
+            if index == goal:
+                return index
+            if (free[index - 1] and not free[index - 1 - step]) or (free[index + 1] and not free[index + 1 - step]):
+                return index
+            # Without diagonals, paths turn horizontally from vertical runs, so a
+            # horizontal jump point seen from here makes this cell a jump point too
+            if not self.diagonal and (self._jump_horizontal(index + 1, 1) >= 0 or self._jump_horizontal(index - 1, -1) >= 0):
+                return index
+            index += step
+        return -1
+
+    def _jump_diagonal(self, current, dr, dc):
+        free, w, goal = self.free, self.width, self.goal
+        vertical = dr * w
+        while free[current + vertical] and free[current + dc]: # No corner cutting
+            current += vertical + dc
+            if not free[current]:
+                return -1
+            if current == goal:
+                return current
+            if self._jump_horizontal(current + dc, dc) >= 0 or self._jump_vertical(current + vertical, vertical) >= 0:
+                return current
+        return -1
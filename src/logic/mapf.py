@@ -0,0 +1,303 @@
+import heapq
+from itertools import count
+
+import numpy as np
+
+from logic.query import PathQuery
+
+def crossing_moves(u, v, width):
+    """
+    Moves of another agent that would pass through an agent moving u -> v in the
+    same step: the swap v -> u and, for a diagonal move, both moves along the
+    other diagonal of the same 2 x 2 square.
+    :param u: Flat cell the agent leaves.
+    :param v: Flat cell the agent enters.
+    :param width: Row stride of the flat cells (PaddedGrid.width).
+    :return: List of (from, to) flat cell pairs.
+    """
+    di = round((v - u) / width)
+    dj = v - u - di * width
+    moves = [(v, u)]
+    if di and dj: # Diagonal: the corners swap across it
+        a, b = u + di * width, u + dj
+        moves += [(a, b), (b, a)]
+    return moves
+
+class ReservationTable:
+    """
+    Space-time occupancy used by the multi-agent searches, with flat padded indices as cells.
+    Prioritized planning fills it with the paths already planned; Conflict-Based
+    Search fills one per agent with that agent's constraints.
+    Attributes:
+        vertices (set): (cell, t) pairs that are taken.
+        edges (set): (u, v, t) moves from u at time t to v at time t + 1 that are forbidden.
+        parked (dict): cell -> time from which an agent waits on it forever.
+        latest (dict): cell -> last time the cell is taken in vertices.
+        horizon (int): Time after which nothing changes except parked cells.
+        width (int): Row stride of the flat cells, to find crossing diagonal moves.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.vertices = set()
+        self.edges = set()
+        self.parked = {}
+        self.latest = {}
+        self.horizon = 0
+
+    def add_vertex(self, cell, t):
+        self.vertices.add((cell, t))
+        self.latest[cell] = max(self.latest.get(cell, -1), t)
+        self.horizon = max(self.horizon, t + 1)
+
+    def add_edge(self, u, v, t):
+        self.edges.add((u, v, t))
+        self.horizon = max(self.horizon, t + 1)
+
+    def reserve(self, path):
+        """
+        Takes every cell of a path at its time step and every move crossing one of
+        its moves (see crossing_moves); the agent then stays on its last cell forever.
+        :param path: List of flat cells, one per time step.
+        :return: None
+        """
+        for t, cell in enumerate(path):
+            self.add_vertex(cell, t)
+        for t, (u, v) in enumerate(zip(path, path[1:])):
+            if u != v: # Another agent may not pass through this move
+                for x, y in crossing_moves(u, v, self.width):
+                    self.add_edge(x, y, t)
+        self.parked[path[-1]] = len(path) - 1
+
+    def blocked(self, cell, t):
+        return (cell, t) in self.vertices or self.parked.get(cell, t + 1) <= t
+
+    def can_stay(self, cell, t):
+        """
+        Whether an agent reaching cell at time t may stay there forever.
+        """
+        return self.latest.get(cell, -1) < t and cell not in self.parked
+
+def space_time_astar(grid, dist, s, g, table):
+    """
+    A* over (cell, time) states with unit-time moves and waits, avoiding a ReservationTable.
+    The heuristic is the distance to the goal, raised to the first time the goal is
+    free for good. States past the table's horizon only differ by their cell, so
+    they are merged and the search always ends.
+    :param grid: PaddedGrid of the Board.
+    :param dist: Distance to the goal of every flat cell (-1 if unreachable), the heuristic.
+    :param s: Flat start cell.
+    :param g: Flat goal cell.
+    :param table: ReservationTable to avoid.
+    :return: (list of flat cells per time step or empty list, number of expanded states)
+    """
+    if dist[s] < 0 or table.blocked(s, 0):
+        return [], 0
+    free, moves, corners = grid.free, grid.moves, grid.corners
+    steps = [(0, 0, 0)] + list(moves) # Waiting is a move too
+    vertices, edges, parked, horizon = table.vertices, table.edges, table.parked, table.horizon
+    big = float("inf")
+    free_at = table.latest.get(g, -1) + 1 # The goal can't be kept before then
+    tie = count()
+    heap = [(max(dist[s], free_at), 0, next(tie), s)] # Ties go to the latest time
+    parent = {(s, 0): None}
+    closed = set()
+    expanded = 0
+    while heap:
+        _, t, _, current = heapq.heappop(heap)
+        t = -t
+        key = (current, min(t, horizon))
+        if key in closed: # Stale entry
+            continue
+        closed.add(key)
+        if current == g and table.can_stay(g, t):
+            path = []
+            state = (current, t)
+            while state is not None:
+                path.append(state[0])
+                state = parent[state]
+            return path[::-1], expanded
+
+        expanded += 1
+        nt = t + 1
+        for off, a, b in steps:
+            neighbor = current + off
+            if not free[neighbor] or (a and free[current + a] + free[current + b] < corners):
+                continue
+            if (neighbor, nt) in vertices or parked.get(neighbor, big) <= nt or (current, neighbor, t) in edges:
+                continue
+            if (neighbor, min(nt, horizon)) in closed:
+                continue
+            parent[(neighbor, nt)] = (current, t)
+            heapq.heappush(heap, (max(nt + dist[neighbor], free_at), -nt, next(tie), neighbor))
+    return [], expanded
+
+def _position(path, t):
+    return path[min(t, len(path) - 1)]
+
+def first_conflict(paths, width):
+    """
+    Finds the earliest collision between paths; agents stay on their last cell.
+    Two moves collide when they swap cells or cross the same 2 x 2 square diagonally.
+    :param paths: List of lists of flat cells per time step.
+    :param width: Row stride of the flat cells (PaddedGrid.width).
+    :return: ("vertex", i, j, cell, t), ("edge", i, j, (u, v), (x, y), t) with agent i
+             moving u -> v while j moves x -> y, or None if the paths are collision-free.
+    """
+    for t in range(max(len(path) for path in paths)):
+        at = {}
+        for i, path in enumerate(paths):
+            cell = _position(path, t)
+            if cell in at:
+                return ("vertex", at[cell], i, cell, t)
+            at[cell] = i
+        moving = {}
+        for i, path in enumerate(paths):
+            u, v = _position(path, t), _position(path, t + 1)
+            if u != v:
+                for move in crossing_moves(u, v, width):
+                    if move in moving:
+                        return ("edge", i, moving[move], (u, v), move, t)
+                moving[(u, v)] = i
+    return None
+
+def random_agents(board, k, rng=None):
+    """
+    Draws k agents with distinct starts and distinct goals, all in the Board's largest
+    connected component so every agent can reach its goal on its own.
+    :param board: Board object.
+    :param k: Number of agents.
+    :param rng: np.random.Generator or seed.
+    :return: List of (start, goal) node pairs.
+    """
+    rng = np.random.default_rng(rng)
+    labels = board.components.labels
+    if not board.components.sizes.size:
+        raise ValueError("The Board has no free cells.")
+    cells = np.flatnonzero(labels.ravel() == int(np.argmax(board.components.sizes)))
+    if 2 * k > cells.size:
+        raise ValueError(f"Cannot place {k} agents on {cells.size} connected cells.")
+    picked = rng.choice(cells, size=2 * k, replace=False)
+    nodes = [divmod(int(cell), labels.shape[1]) for cell in picked]
+    return list(zip(nodes[:k], nodes[k:]))
+
+class MultiAgentPlanner:
+    """
+    Collision-free plans for many agents on one Board.
+    Time is discrete: at every step each agent moves to a neighbour cell (Board's
+    movement model) or waits. Two agents may never share a cell at the same time,
+    swap cells in one step or cross each other diagonally, and an agent keeps its
+    goal cell once it is done.
+    The PaddedGrid and the per-goal distance tables (the heuristic) come from a
+    PathQuery, so they are built once and shared by all agents and all calls.
+    Attributes:
+        board (Board): Board the agents move on.
+        query (PathQuery): Cache of BFS trees rooted at the goals.
+    """
+
+    def __init__(self, board, query=None):
+        self.board = board
+        self.query = query if query is not None else PathQuery(board)
+
+    def _prepare(self, agents):
+        grid = self.query.grid
+        starts = [grid.index(s) for s, _ in agents]
+        goals = [grid.index(g) for _, g in agents]
+        if len(set(starts)) != len(starts) or len(set(goals)) != len(goals):
+            raise ValueError("Agents must have distinct starts and distinct goals.")
+        for s, g in agents:
+            if not (grid.inside(s) and grid.inside(g)):
+                raise ValueError(f"Agent ({s}, {g}) is out of bounds.")
+        dists = [self.query.tree(g)[1] for _, g in agents]
+        return grid, starts, goals, dists
+
+    def _result(self, grid, paths, stats, **counters):
+        if stats is not None:
+            stats.update(counters)
+            stats["sum_of_costs"] = sum(len(path) - 1 for path in paths) if paths else None
+            stats["makespan"] = max((len(path) - 1 for path in paths), default=0) if paths else None
+        return [[grid.node(cell) for cell in path] for path in paths]
+
+    def prioritized(self, agents, order=None, stats=None):
+        """
+        Prioritized planning: agents are planned one at a time with space-time A*,
+        each avoiding the reservations of the agents planned before it.
+        Fast and scales to many agents, but not complete: an agent may find no plan
+        around the higher-priority ones even though a joint plan exists.
+        :param agents: List of (start, goal) node pairs.
+        :param order: Planning order (list of agent indices); longest trip first if None.
+        :param stats: Optional dict, receives "expanded", "sum_of_costs" and "makespan".
+        :return: One path per agent (lists of nodes per time step, waits repeat the node),
+                 or empty list if some agent could not be planned.
+        """
+        grid, starts, goals, dists = self._prepare(agents)
+        if order is None:
+            order = sorted(range(len(agents)), key=lambda i: -dists[i][starts[i]])
+        table = ReservationTable(grid.width)
+        paths = [None] * len(agents)
+        expanded = 0
+        for i in order:
+            path, n = space_time_astar(grid, dists[i], starts[i], goals[i], table)
+            expanded += n
+            if not path:
+                return self._result(grid, [], stats, expanded=expanded)
+            table.reserve(path)
+            paths[i] = path
+        return self._result(grid, paths, stats, expanded=expanded)
+
+    def cbs(self, agents, max_nodes=500, stats=None):
+        """
+        Conflict-Based Search: optimal in sum of costs, for small fleets.
+        Agents are planned independently; the first collision found splits the
+        search into two branches, each forbidding it for one of the two agents,
+        and only that agent is replanned.
+        :param agents: List of (start, goal) node pairs.
+        :param max_nodes: Limit of constraint tree nodes before giving up.
+        :param stats: Optional dict, receives "expanded", "high_level" (constraint tree
+                      nodes expanded), "sum_of_costs" and "makespan".
+        :return: One path per agent (lists of nodes per time step), or empty list if no
+                 plan was found within max_nodes.
+        """
+        grid, starts, goals, dists = self._prepare(agents)
+        expanded = 0
+
+        def plan(i, constraints):
+            nonlocal expanded
+            table = ReservationTable(grid.width)
+            for constraint in constraints:
+                if len(constraint) == 2:
+                    table.add_vertex(*constraint)
+                else:
+                    table.add_edge(*constraint)
+            path, n = space_time_astar(grid, dists[i], starts[i], goals[i], table)
+            expanded += n
+            return path
+
+        constraints = [() for _ in agents]
+        paths = [plan(i, ()) for i in range(len(agents))]
+        if not all(paths):
+            return self._result(grid, [], stats, expanded=expanded, high_level=0)
+        tie = count()
+        heap = [(sum(map(len, paths)), next(tie), constraints, paths)]
+        nodes = 0
+        while heap and nodes < max_nodes:
+            _, _, constraints, paths = heapq.heappop(heap)
+            conflict = first_conflict(paths, grid.width)
+            if conflict is None:
+                return self._result(grid, paths, stats, expanded=expanded, high_level=nodes)
+            nodes += 1
+            if conflict[0] == "vertex":
+                _, i, j, cell, t = conflict
+                branches = ((i, (cell, t)), (j, (cell, t)))
+            else:
+                _, i, j, (u, v), (x, y), t = conflict
+                branches = ((i, (u, v, t)), (j, (x, y, t)))
+            for agent, constraint in branches:
+                child = list(constraints)
+                child[agent] = constraints[agent] + (constraint,)
+                path = plan(agent, child[agent])
+                if path:
+                    child_paths = list(paths)
+                    child_paths[agent] = path
+                    heapq.heappush(heap, (sum(map(len, child_paths)), next(tie), child, child_paths))
+        return self._result(grid, [], stats, expanded=expanded, high_level=nodes)
@@ -0,0 +1,78 @@
+import struct
+
+import numpy as np
+
+from logic.board import Board
+from logic.oracle import DistanceOracle
+
+# Raw map layout: 8-byte magic, then rows, cols, ix, iy, fx, fy, n as little-endian int64,
+# then rows * cols int8 cells in row-major order
+MAGIC = b"PFMAP\x00\x00\x01"
+HEADER = struct.Struct("<8s7q")
+
+def save_map(board, path):
+    """
+    Saves a Board to disk.
+    Files ending in .npy are written with np.save; anything else uses the raw
+    int8 layout with a small header, which loads without scanning the cells.
+    :param board: Board object.
+    :param path: Destination file path.
+    :return: None
+    """
+    if str(path).endswith(".npy"):
+        np.save(path, board.grid)
+        return
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, board.R, board.C, board.ix, board.iy, board.fx, board.fy, board.n))
+        board.grid.tofile(f)
+
+def load_map(path, mode="r"):
+    """
+    Opens a map saved with save_map as a Board backed by np.memmap.
+    Cells stay on disk and are paged in on demand, so loading takes near-constant
+    time and several processes opening the same file share the same pages.
+    Raw files read everything from the header; .npy files need one scan of the
+    cells to find the initial and final positions.
+    Only the cells are mapped: each search still allocates its own per-cell arrays
+    in RAM, e.g. PaddedGrid's free mask (1 byte per cell), a BFS tree (8 bytes per
+    cell) and the connectivity labels behind has_path (4 bytes per cell).
+    :param path: File path.
+    :param mode: np.memmap mode: 'r' read-only, 'r+' to write changes back, 'c' copy-on-write.
+    :return: Board object.
+    """
+    if str(path).endswith(".npy"):
+        return Board.from_array(np.load(path, mmap_mode=mode))
+
+    with open(path, "rb") as f:
+        magic, r, c, ix, iy, fx, fy, n = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a map file.")
+    grid = np.memmap(path, dtype=np.int8, mode=mode, offset=HEADER.size, shape=(r, c))
+    return Board.from_array(grid, start=(ix, iy), goal=(fx, fy), n=n)
+
+def oracle_path(path):
+    """
+    :param path: Map file path.
+    :return: Path of the distance oracle stored next to the map.
+    """
+    return f"{path}.oracle.npz"
+
+def load_oracle(board, path, landmarks=8):
+    """
+    Sets the Board's distance oracle from the file next to its map, so it is only
+    computed once per map. The oracle is built and saved when the file is missing
+    or was built from a different Board (e.g. the map was edited).
+    :param board: Board loaded from path.
+    :param path: Map file path.
+    :param landmarks: Number of landmarks when the oracle has to be built.
+    :return: DistanceOracle object.
+    """
+    target = oracle_path(path)
+    graph = board.csr_graph() # The Board may have been edited since it was loaded
+    try:
+        oracle = DistanceOracle.load(target, graph)
+    except (OSError, ValueError): # Missing or stale
+        oracle = DistanceOracle.build(graph, landmarks)
+        oracle.save(target)
+    board.oracle = oracle
+    return oracle
@@ -0,0 +1,238 @@
+import hashlib
+import heapq
+from collections import deque
+
+import numpy as np
+
+from logic.heuristics import SQRT2
+from logic.instrument import instrumented
+
+# Largest number of connected cells for which an exact all-pairs table is built by default
+ALL_PAIRS_MAX = 1024
+
+def _fingerprint(graph):
+    """
+    Digest of a Graph's CSR arrays, used to tell whether a saved oracle matches a Board.
+    :param graph: Graph object with its CSR arrays.
+    :return: Hex string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(graph.shape, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(graph.offsets).tobytes())
+    digest.update(np.ascontiguousarray(graph.neighbors).tobytes())
+    if graph.weights is not None:
+        digest.update(np.ascontiguousarray(graph.weights, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+def _sssp(offsets, neighbors, weights, source):
+    """
+    Distances from source to every cell over CSR lists: BFS for unit weights, Dijkstra otherwise.
+    :param offsets: CSR offsets (list).
+    :param neighbors: CSR neighbour cell ids (list).
+    :param weights: CSR edge weights (list), or None when every move costs 1.
+    :param source: Source cell id.
+    :return: List of distances, -1 for cells that are not reached.
+    """
+    dist = [-1] * (len(offsets) - 1)
+    dist[source] = 0
+    if weights is None:
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            d = dist[current] + 1
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = neighbors[k]
+                if dist[neighbor] < 0:
+                    dist[neighbor] = d
+                    queue.append(neighbor)
+        return dist
+
+    done = [False] * len(dist)
+    heap = [(0, source)]
+    while heap:
+        d, current = heapq.heappop(heap)
+        if done[current]: # Stale entry
+            continue
+        done[current] = True
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = neighbors[k]
+            nd = d + weights[k]
+            if not done[neighbor] and (dist[neighbor] < 0 or nd < dist[neighbor]):
+                dist[neighbor] = nd
+                heapq.heappush(heap, (nd, neighbor))
+    return dist
+
+class DistanceOracle:
+    """
+    Precomputed distances for many start/goal queries on a static Board.
+    ALT landmarks: the distances from (and, with a cost map, to) a few landmark
+    cells chosen far apart give, by the triangle inequality, a lower bound of any
+    distance that is tight whenever the shortest path runs towards or away from a
+    landmark. lower_bound works as an A* heuristic (see the "alt" algorithm).
+    Small Boards also get an exact all-pairs table, so distance() is one lookup.
+    Either way a query costs O(landmarks), whatever the size of the Board.
+    Distances are the Graph's edge weights (cell costs, diagonals times sqrt(2)).
+    The landmark arrays take landmarks * rows * cols * 4 bytes (8 with diagonals or
+    a cost map) and are stored node-major, so a query reads two short rows.
+    Usage:
+        oracle = DistanceOracle.build(board.graph)
+        oracle.save("map.oracle.npz")
+        oracle = DistanceOracle.load("map.oracle.npz", board.graph)
+    Attributes:
+        shape (tuple): Shape (rows, cols) of the Board.
+        landmarks (np.ndarray): Cell ids of the landmarks.
+        forward (np.ndarray): (cells, landmarks) distances from each landmark, -1 if unreached.
+        backward (np.ndarray): (cells, landmarks) distances to each landmark, or None when
+                               every move costs the same both ways (no cost map).
+        cells (np.ndarray): Cell ids covered by the all-pairs table, or None.
+        table (np.ndarray): (len(cells), len(cells)) exact distances, -1 if unreachable, or None.
+        fingerprint (str): Digest of the Graph the oracle was built from.
+    """
+
+    def __init__(self, shape, landmarks, forward, backward=None, cells=None, table=None, fingerprint=""):
+        self.shape = tuple(int(x) for x in shape)
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.cells = cells
+        self.table = table
+        self.fingerprint = fingerprint
+        self._slot = None # cell id -> row of the table
+        if cells is not None:
+            self._slot = np.full(self.shape[0] * self.shape[1], -1, dtype=np.int32)
+            self._slot[cells] = np.arange(len(cells), dtype=np.int32)
+        self._target = (None, None, None) # Rows of the last goal, reused while A* runs
+
+    @classmethod
+    @instrumented("oracle.build")
+    def build(cls, graph, landmarks=8, all_pairs=None, rng=0):
+        """
+        Builds the oracle from a Graph's CSR arrays.
+        Landmarks are chosen by farthest-point sampling: each one is the cell
+        farthest from the landmarks chosen so far, starting from a random cell.
+        :param graph: Graph object built with build_from_board (a patched Graph has no CSR arrays).
+        :param landmarks: Number of landmarks.
+        :param all_pairs: Whether to build the all-pairs table; None builds it when the
+                          Board has at most ALL_PAIRS_MAX connected cells.
+        :param rng: np.random.Generator or seed for the first landmark.
+        :return: DistanceOracle object.
+        """
+        if graph.offsets is None:
+            raise ValueError("The Graph was patched and has no CSR arrays; build a new one from the Board.")
+        r, c = graph.shape
+        offsets = graph.offsets.tolist()
+        neighbors = graph.neighbors.tolist()
+        linked = np.flatnonzero(np.diff(graph.offsets) > 0) # Cells with at least one move
+        dtype = np.int32 if graph.weights is None else np.float64
+        forward_weights = None if graph.weights is None else graph.weights.tolist()
+        backward_weights = None
+        if graph.costs is not None: # Moving u -> v costs the cost of v, so distances differ by direction
+            owner = np.repeat(np.arange(r * c), np.diff(graph.offsets))
+            diagonal = (owner // c != graph.neighbors // c) & (owner % c != graph.neighbors % c)
+            backward_weights = (graph.costs.ravel()[owner] * np.where(diagonal, SQRT2, 1.0)).tolist()
+
+        chosen, forward, backward = [], [], []
+        rng = np.random.default_rng(rng)
+        nearest = None
+        if linked.size:
+            probe = np.array(_sssp(offsets, neighbors, forward_weights, int(rng.choice(linked))), dtype=dtype)
+            nearest = np.where(probe >= 0, probe, -np.inf)
+        for _ in range(min(landmarks, linked.size)):
+            landmark = int(np.argmax(nearest))
+            if nearest[landmark] <= 0 and chosen: # Every reachable cell is a landmark already
+                break
+            chosen.append(landmark)
+            dist = np.array(_sssp(offsets, neighbors, forward_weights, landmark), dtype=dtype)
+            forward.append(dist)
+            if backward_weights is not None: # Distances to the landmark: search the reversed edges
+                backward.append(np.array(_sssp(offsets, neighbors, backward_weights, landmark), dtype=dtype))
+            nearest = np.where(dist >= 0, np.minimum(nearest, dist), nearest) if len(chosen) > 1 else np.where(dist >= 0, dist, -np.inf)
+
+        def stack(columns):
+            return np.stack(columns, axis=1) if columns else np.zeros((r * c, 0), dtype=dtype)
+
+        cells = table = None
+        if all_pairs or (all_pairs is None and linked.size <= ALL_PAIRS_MAX):
+            cells = linked.astype(np.int32)
+            table = np.stack([np.array(_sssp(offsets, neighbors, forward_weights, int(cell)), dtype=dtype)[cells] for cell in cells]) \
+                if cells.size else np.zeros((0, 0), dtype=dtype)
+        return cls((r, c), np.array(chosen, dtype=np.int32), stack(forward),
+                   stack(backward) if backward_weights is not None else None, cells, table, _fingerprint(graph))
+
+    def _id(self, node):
+        return node[0] * self.shape[1] + node[1]
+
+    def distance(self, a, b):
+        """
+        Exact distance from a to b, one table lookup. Needs the all-pairs table,
+        except when a is a landmark.
+        :param a: Source node (tuple).
+        :param b: Target node (tuple).
+        :return: Distance, or -1 if b is unreachable from a.
+        """
+        u, v = self._id(a), self._id(b)
+        if u == v:
+            return 0
+        if self.table is not None:
+            i, j = self._slot[u], self._slot[v]
+            return self.table[i, j].item() if i >= 0 and j >= 0 else -1
+        hit = np.flatnonzero(self.landmarks == u)
+        if hit.size:
+            return self.forward[v, hit[0]].item()
+        raise ValueError("The oracle has no all-pairs table; use lower_bound or a search.")
+
+    def lower_bound(self, a, b):
+        """
+        ALT lower bound of the distance from a to b: the largest
+        d(L, b) - d(L, a) and d(a, L) - d(b, L) over the landmarks L.
+        Its signature matches the heuristics of logic.heuristics, so it can be passed to astar.
+        When a and b are in different components the value is meaningless (there is no path).
+        :param a: Node (tuple).
+        :param b: Goal node (tuple).
+        :return: Lower bound of the distance.
+        """
+        if not self.landmarks.size:
+            return 0
+        target, fv, bv = self._target
+        if target != b:
+            v = self._id(b)
+            fv = self.forward[v]
+            bv = None if self.backward is None else self.backward[v]
+            self._target = (b, fv, bv)
+        u = self._id(a)
+        if bv is None: # Symmetric distances
+            return max(np.abs(fv - self.forward[u]).max().item(), 0)
+        return max((fv - self.forward[u]).max().item(), (self.backward[u] - bv).max().item(), 0)
+
+    def save(self, path):
+        """
+        Writes the oracle with np.savez.
+        :param path: Destination file path (.npz is appended if missing).
+        :return: None
+        """
+        extra = {}
+        if self.backward is not None:
+            extra["backward"] = self.backward
+        if self.table is not None:
+            extra["cells"] = self.cells
+            extra["table"] = self.table
+        np.savez(path, shape=np.array(self.shape), landmarks=self.landmarks, forward=self.forward,
+                 fingerprint=np.array(self.fingerprint), **extra)
+
+    @classmethod
+    def load(cls, path, graph=None):
+        """
+        Reads an oracle written by save.
+        :param path: File path.
+        :param graph: Optional Graph the oracle must have been built from.
+        :return: DistanceOracle object.
+        """
+        with np.load(path) as data:
+            oracle = cls(data["shape"], data["landmarks"], data["forward"],
+                         data["backward"] if "backward" in data else None,
+                         data["cells"] if "cells" in data else None,
+                         data["table"] if "table" in data else None,
+                         str(data["fingerprint"]))
+        if graph is not None and oracle.fingerprint != _fingerprint(graph):
+            raise ValueError(f"'{path}' was built from a different Board.")
+        return oracle
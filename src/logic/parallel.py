@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from logic.board import Board
+from logic.solvers import solve
+
+def path_to_ids(path, cols):
+    """
+    Packs a path into a compact array of flat cell ids.
+    :param path: List of nodes (tuples).
+    :param cols: Number of columns of the Board.
+    :return: np.int32 array of row * cols + col.
+    """
+    if len(path) == 0:
+        return np.empty(0, dtype=np.int32)
+    rows, columns = np.asarray(path, dtype=np.int64).T
+    return (rows * cols + columns).astype(np.int32)
+
+def ids_to_path(ids, cols):
+    """
+    Unpacks an array of flat cell ids into a path.
+    :param ids: Array of row * cols + col.
+    :param cols: Number of columns of the Board.
+    :return: List of nodes (tuples).
+    """
+    rows, columns = np.divmod(np.asarray(ids, dtype=np.int64), cols)
+    return list(zip(rows.tolist(), columns.tolist()))
+
+def _solve_one(spec, seed, algorithm, return_grid):
+    """
+    Worker: generates one Board from its spec and seed and solves it.
+    Only NumPy arrays cross the process boundary.
+    :return: (path ids, grid or None)
+    """
+    r, c, ix, iy, fx, fy, n = spec
+    board = Board(r=r, c=c, ix=ix, iy=iy, fx=fx, fy=fy, n=n, rng=np.random.default_rng(seed))
+    path = solve(board, algorithm)
+    return path_to_ids(path, c), (board.grid if return_grid else None)
+
+def solve_batch(specs, algorithm="bfs-grid", seed=None, workers=None, chunksize=None, return_grids=False):
+    """
+    Generates and solves many independent Boards on a pool of worker processes.
+    Each Board gets its own RNG stream spawned from one SeedSequence, so results
+    do not depend on the number of workers or on scheduling.
+    On platforms that spawn processes (Windows, macOS) call it under `if __name__ == "__main__":`.
+    :param specs: Iterable of (r, c, ix, iy, fx, fy, n) tuples, as produced by SimpleGUI._validate_inputs.
+    :param algorithm: Name of the algorithm, one of logic.solvers.ALGORITHMS.
+    :param seed: Root seed (int) or np.random.SeedSequence; fresh entropy if None.
+    :param workers: Number of processes, os.cpu_count() if None; 1 solves in this process.
+    :param chunksize: Specs sent to a worker at a time; picked from the batch size if None.
+    :param return_grids: Whether to return the np.int8 grid of each Board as well.
+    :return: List with one np.int32 array of flat path ids per spec (empty if no path),
+             or (path ids, grid) tuples if return_grids is True.
+    """
+    specs = list(specs)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = root.spawn(len(specs))
+    workers = workers or os.cpu_count() or 1
+
+    args = (specs, seeds, repeat(algorithm), repeat(return_grids))
+    if workers == 1:
+        results = list(map(_solve_one, *args))
+    else:
+        if chunksize is None: # A few chunks per worker balances load without much IPC
+            chunksize = max(1, len(specs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_solve_one, *args, chunksize=chunksize))
+
+    if return_grids:
+        return results
+    return [ids for ids, _ in results]
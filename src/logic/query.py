@@ -0,0 +1,109 @@
+from collections import OrderedDict
+
+from logic.bfs import bfs_tree
+from logic.grid import PaddedGrid
+
+class PathQuery:
+    """
+    Answers many path queries on the same Board from cached single-source BFS trees.
+    A tree (parent and distance arrays) is computed once per source; every goal
+    query from that source is then a walk up the tree.
+    Trees live in an LRU cache keyed by (board version, source), so they are
+    recomputed automatically after the Board changes.
+    Attributes:
+        board (Board): Board the queries run on.
+        max_bytes (int): Memory bound for the cached trees; the most recent tree is always kept.
+        hits (int): Number of queries answered from the cache.
+        misses (int): Number of trees computed.
+    """
+
+    def __init__(self, board, max_bytes=256 * 1024 * 1024):
+        self.board = board
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+        self._bytes = 0
+        self._grid = None
+        self._grid_version = None
+
+    def _current_grid(self):
+        if self._grid is None or self._grid_version != self.board.version:
+            self._grid = PaddedGrid(self.board)
+            self._grid_version = self.board.version
+        return self._grid
+
+    @property
+    def grid(self):
+        """
+        PaddedGrid of the Board's current version; the cached trees are indexed by its flat indices.
+        :return: PaddedGrid object.
+        """
+        return self._current_grid()
+
+    def tree(self, source):
+        """
+        Returns the BFS tree rooted at source, computing it if it is not cached.
+        :param source: Source node (tuple).
+        :return: (parent, dist) arrays indexed by flat padded index.
+        """
+        key = (self.board.version, source)
+        if key in self._trees:
+            self.hits += 1
+            self._trees.move_to_end(key)
+            return self._trees[key]
+
+        self.misses += 1
+        tree = bfs_tree(self._current_grid(), source)
+        self._trees[key] = tree
+        self._bytes += sum(a.itemsize * len(a) for a in tree)
+        while self._bytes > self.max_bytes and len(self._trees) > 1: # Evict least recently used
+            _, old = self._trees.popitem(last=False)
+            self._bytes -= sum(a.itemsize * len(a) for a in old)
+        return tree
+
+    def distance(self, source, goal):
+        """
+        Number of moves of the shortest path from source to goal.
+        :param source: Source node (tuple).
+        :param goal: Goal node (tuple).
+        :return: Distance (int), or -1 if goal is unreachable.
+        """
+        grid = self._current_grid()
+        if not grid.inside(goal):
+            return -1
+        _, dist = self.tree(source)
+        return dist[grid.index(goal)]
+
+    def path(self, source, goal):
+        """
+        Shortest path from source to goal, the same one bfs_grid returns.
+        :param source: Source node (tuple).
+        :param goal: Goal node (tuple).
+        :return: List of nodes representing the path, or empty list if no path found.
+        """
+        grid = self._current_grid()
+        if not grid.inside(goal):
+            return []
+        parent, _ = self.tree(source)
+        g = grid.index(goal)
+        if parent[g] < 0:
+            return []
+        return grid.trace(parent, g)
+
+    def paths(self, source, goals):
+        """
+        Shortest paths from source to each goal, sharing one BFS tree.
+        :param source: Source node (tuple).
+        :param goals: Iterable of goal nodes (tuples).
+        :return: List of paths, in the same order as goals.
+        """
+        return [self.path(source, goal) for goal in goals]
+
+    def clear(self):
+        """
+        Drops every cached tree.
+        :return: None
+        """
+        self._trees.clear()
+        self._bytes = 0
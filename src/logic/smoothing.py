@@ -0,0 +1,57 @@
+from logic.grid import OBSTACLE, as_array
+
+def segment_cells(a, b):
+    """
+    Cells touched by the straight segment between the centres of cells a and b.
+    When the segment passes exactly through a cell corner, both cells beside the
+    corner are included, so the check is conservative.
+    :param a: First node (tuple).
+    :param b: Second node (tuple).
+    :return: Generator of nodes (tuples), from a to b.
+    """
+    (r, c), (r1, c1) = a, b
+    nr, nc = abs(r1 - r), abs(c1 - c)
+    sr, sc = (r1 > r) - (r1 < r), (c1 > c) - (c1 < c)
+    yield (r, c)
+    ir = ic = 0
+    while ir < nr or ic < nc:
+        # Compare when the segment crosses the next row boundary and the next column boundary
+        t = (1 + 2 * ir) * nc - (1 + 2 * ic) * nr
+        if t == 0: # Through a corner
+            yield (r + sr, c)
+            yield (r, c + sc)
+            r, c, ir, ic = r + sr, c + sc, ir + 1, ic + 1
+        elif t < 0:
+            r, ir = r + sr, ir + 1
+        else:
+            c, ic = c + sc, ic + 1
+        yield (r, c)
+
+def line_of_sight(board, a, b):
+    """
+    Checks whether the straight segment between cells a and b only touches free cells.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :param a: First node (tuple).
+    :param b: Second node (tuple).
+    :return: True if the segment is clear, False otherwise.
+    """
+    arr = as_array(board)
+    return all(arr[cell] != OBSTACLE for cell in segment_cells(a, b))
+
+def smooth_path(board, path):
+    """
+    Any-angle post-pass: drops every waypoint that the previous kept waypoint
+    can see past, leaving only the turning points of the path.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :param path: List of nodes of a grid path.
+    :return: List of waypoints (tuples), starting and ending like path.
+    """
+    if len(path) < 3:
+        return list(path)
+    arr = as_array(board)
+    waypoints = [path[0]]
+    for previous, node in zip(path[1:], path[2:]):
+        if not line_of_sight(arr, waypoints[-1], node):
+            waypoints.append(previous)
+    waypoints.append(path[-1])
+    return waypoints
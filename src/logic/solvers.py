@@ -0,0 +1,65 @@
+from logic.astar import astar
+from logic.bfs import bfs, bfs_frontier, bfs_grid
+from logic.bidirectional import bidirectional_bfs
+from logic.dijkstra import dijkstra, dijkstra_grid
+from logic.instrument import recording, stage
+from logic.jps import jps
+from logic.smoothing import smooth_path
+
+# Every entry takes (board, start, goal, stats=None) and returns the path as a list of nodes.
+# All of them follow the Board's movement model; astar, alt and dijkstra* also follow its cost map,
+# the others count moves. hpa reuses the Board's hierarchy and returns near-optimal paths.
+# alt is astar guided by the Board's landmark oracle, worth it when the oracle is reused.
+ALGORITHMS = {
+    "bfs": lambda board, start, goal, stats=None: bfs(board.graph, start, goal, stats),
+    "bfs-grid": lambda board, start, goal, stats=None: bfs_grid(board, start, goal, stats),
+    "bfs-frontier": lambda board, start, goal, stats=None: bfs_frontier(board, start, goal, stats),
+    "astar": lambda board, start, goal, stats=None: astar(board.graph, start, goal, stats=stats),
+    "bidirectional": lambda board, start, goal, stats=None: bidirectional_bfs(board.graph, start, goal, stats),
+    "jps": lambda board, start, goal, stats=None: jps(board, start, goal, stats=stats),
+    "dijkstra": lambda board, start, goal, stats=None: dijkstra(board.graph, start, goal, stats),
+    "dijkstra-grid": lambda board, start, goal, stats=None: dijkstra_grid(board, start, goal, stats=stats),
+    "hpa": lambda board, start, goal, stats=None: board.hierarchy.path(start, goal, stats),
+    "alt": lambda board, start, goal, stats=None: astar(board.graph, start, goal, board.oracle.lower_bound, stats),
+}
+
+def solve(board, algorithm="bfs", stats=None):
+    """
+    Finds a path from the Board's initial position to its final position.
+    Unreachable positions are detected with the Board's connectivity index and
+    return immediately, without searching. With the any-angle movement model the
+    path is smoothed and only its waypoints are returned.
+    :param board: Board object.
+    :param algorithm: Name of the algorithm, one of ALGORITHMS.
+    :param stats: Optional dict (or Stats), receives search statistics (e.g. "expanded") and "path_length".
+    :return: List of nodes representing the path, or empty list if no path found.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'. Choose one of: {', '.join(ALGORITHMS)}")
+    with stage(f"search.{algorithm}"):
+        if not board.has_path():
+            path = []
+            if stats is not None:
+                stats["expanded"] = 0
+        else:
+            path = ALGORITHMS[algorithm](board, (board.ix, board.iy), (board.fx, board.fy), stats)
+            if board.movement == "any-angle":
+                path = smooth_path(board, path)
+    if stats is not None:
+        stats["path_length"] = len(path)
+    return path
+
+def solve_instrumented(board, algorithm="bfs", memory=False, profile=False):
+    """
+    Same as solve, but also returns what the run measured: wall time of every stage
+    (Graph or connectivity builds triggered by the search included), the search
+    counters and, on request, peak memory and a cProfile capture.
+    :param board: Board object.
+    :param algorithm: Name of the algorithm, one of ALGORITHMS.
+    :param memory: Whether to trace peak memory per stage with tracemalloc.
+    :param profile: Whether to capture a cProfile of the run.
+    :return: (path, Stats)
+    """
+    with recording(memory, profile) as stats:
+        path = solve(board, algorithm, stats)
+    return path, stats
@@ -0,0 +1,100 @@
+from math import gcd
+
+from logic.bfs import bfs_tree
+from logic.grid import PaddedGrid
+
+# Number of lines write_path buffers before each write
+WRITE_CHUNK = 4096
+
+def walk_tree(grid, parent, start):
+    """
+    Yields the nodes from start up to the root of a BFS tree.
+    With the tree rooted at the goal, this is the path from start to goal in
+    order, one node at a time, without building or reversing a list.
+    :param grid: PaddedGrid the tree was computed on.
+    :param parent: Parent array indexed by flat padded indices (root is its own parent).
+    :param start: Starting node (tuple).
+    :return: Generator of nodes; empty if start is not in the tree.
+    """
+    if not grid.inside(start):
+        return
+    index = grid.index(start)
+    if parent[index] < 0:
+        return
+    while True:
+        yield grid.node(index)
+        up = parent[index]
+        if up == index:
+            return
+        index = up
+
+def stream_path(board, start, goal, query=None):
+    """
+    Shortest path (in moves) from start to goal, yielded lazily.
+    A full BFS is run from the goal and its parent array is walked from the start,
+    so only the tree (two ints per cell) is held in memory, never the path.
+    The search runs when this is called; the nodes are produced as they are consumed.
+    The path has the same length as the bfs one.
+    :param board: Board object, DataFrame or 2D array (-1 marks obstacles).
+    :param start: Starting node (tuple).
+    :param goal: Goal node (tuple).
+    :param query: Optional PathQuery of the Board, whose cached tree for goal is reused.
+    :return: Generator of nodes; empty if no path found.
+    """
+    grid = query.grid if query is not None else PaddedGrid(board)
+    if not grid.inside(goal):
+        return iter(())
+    parent, _ = query.tree(goal) if query is not None else bfs_tree(grid, goal)
+    return walk_tree(grid, parent, start)
+
+def segments(nodes):
+    """
+    Run-length compression of a path: every straight run collapses to its end points.
+    Consecutive segments share a node. Works on any iterable of nodes, including
+    any-angle waypoints (steps are compared by direction, not length).
+    :param nodes: Iterable of nodes (tuples), e.g. stream_path or a solved path.
+    :return: Generator of (first, last) node pairs.
+    """
+    nodes = iter(nodes)
+    first = next(nodes, None)
+    if first is None:
+        return
+    last = first
+    heading = None
+    for node in nodes:
+        dr, dc = node[0] - last[0], node[1] - last[1]
+        step = gcd(dr, dc) or 1
+        direction = (dr // step, dc // step)
+        if heading is not None and direction != heading:
+            yield first, last
+            first = last
+        heading = direction
+        last = node
+    yield first, last
+
+def write_path(nodes, out, compress=False):
+    """
+    Writes a path as CSV lines, consuming it incrementally in chunks of WRITE_CHUNK lines.
+    One "row,col" line per node, or one "row,col,row,col" line per straight segment
+    when compress is set.
+    :param nodes: Iterable of nodes (tuples), e.g. stream_path or a solved path.
+    :param out: Text file object.
+    :param compress: Whether to write segments instead of nodes.
+    :return: Number of lines written, header excluded (int).
+    """
+    out.write("row,col,end_row,end_col\n" if compress else "row,col\n")
+    items = segments(nodes) if compress else nodes
+    lines = []
+    count = 0
+    for item in items:
+        if compress:
+            (a, b), (c, d) = item
+            lines.append(f"{a},{b},{c},{d}\n")
+        else:
+            lines.append(f"{item[0]},{item[1]}\n")
+        if len(lines) == WRITE_CHUNK:
+            out.write("".join(lines))
+            count += len(lines)
+            lines.clear()
+    out.write("".join(lines))
+    return count + len(lines)
@@ -0,0 +1,198 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+import numpy as np
+
+from logic.board import Board
+from logic.solvers import ALGORITHMS, solve
+
+MAPF_METHODS = ("prioritized", "cbs")
+
+def parse_sizes(text):
+    """
+    Parses a list of board sizes such as "100,200x50".
+    :param text: Comma separated sizes, each R or RxC.
+    :return: List of (R, C) tuples.
+    """
+    sizes = []
+    for item in text.split(","):
+        r, _, c = item.strip().lower().partition("x")
+        sizes.append((int(r), int(c or r)))
+    return sizes
+
+def parse_seeds(text):
+    """
+    Parses a list of seeds such as "0,1,5-9".
+    :param text: Comma separated seeds or inclusive ranges.
+    :return: List of seeds (int).
+    """
+    seeds = []
+    for item in text.split(","):
+        first, _, last = item.strip().partition("-")
+        seeds.extend(range(int(first), int(last or first) + 1))
+    return seeds
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="bench", description="Headless batch benchmark: builds boards and runs searches.")
+    parser.add_argument("--spec", help="JSON file with any of: sizes, densities, seeds, algorithms (same syntax as the flags).")
+    parser.add_argument("--sizes", default="50,100,200", help="Board sizes, e.g. 100,200x50 (default: %(default)s)")
+    parser.add_argument("--densities", default="0.1,0.3", help="Obstacle densities in [0, 1] (default: %(default)s)")
+    parser.add_argument("--seeds", default="0-4", help="Seeds, e.g. 0,1,5-9 (default: %(default)s)")
+    parser.add_argument("--algorithms", default="bfs,bfs-grid", help=f"Any of: {', '.join(ALGORITHMS)} (default: %(default)s)")
+    parser.add_argument("--agents", help="Multi-agent mode: agent counts, e.g. 2,8,32 (replaces --algorithms).")
+    parser.add_argument("--mapf", default="prioritized,cbs", help=f"Multi-agent methods, any of: {', '.join(MAPF_METHODS)} (default: %(default)s)")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    parser.add_argument("--output", help="Write results to this file instead of stdout.")
+    args = parser.parse_args(argv)
+
+    if args.spec: # Values from the spec file override the flags
+        with open(args.spec) as f:
+            for key, value in json.load(f).items():
+                setattr(args, key, ",".join(map(str, value)) if isinstance(value, list) else str(value))
+    spec = {
+        "sizes": parse_sizes(args.sizes),
+        "densities": [float(d) for d in args.densities.split(",")],
+        "seeds": parse_seeds(args.seeds),
+        "algorithms": [a.strip() for a in args.algorithms.split(",")],
+    }
+    for algorithm in spec["algorithms"]:
+        if algorithm not in ALGORITHMS:
+            parser.error(f"unknown algorithm '{algorithm}'")
+    if args.agents:
+        spec["agents"] = [int(k) for k in args.agents.split(",")]
+        spec["mapf"] = [m.strip() for m in args.mapf.split(",")]
+        for method in spec["mapf"]:
+            if method not in MAPF_METHODS:
+                parser.error(f"unknown multi-agent method '{method}'")
+    return spec, args
+
+def run_bench(spec):
+    """
+    Builds one Board per (size, density, seed, algorithm), runs the search, and
+    aggregates the measurements per (size, density, algorithm).
+    The initial and final positions are opposite corners of the Board.
+    :param spec: Dict with sizes, densities, seeds and algorithms.
+    :return: List of result rows (dicts).
+    """
+    rows = []
+    for r, c in spec["sizes"]:
+        for density in spec["densities"]:
+            n = min(int(density * r * c), r * c - 2)
+            for algorithm in spec["algorithms"]:
+                build, search, expanded, lengths = [], [], 0, []
+                for seed in spec["seeds"]:
+                    t0 = time.perf_counter()
+                    board = Board(r=r, c=c, ix=0, iy=0, fx=r - 1, fy=c - 1, n=n, rng=seed)
+                    t1 = time.perf_counter()
+                    stats = {}
+                    path = solve(board, algorithm, stats)
+                    t2 = time.perf_counter()
+                    build.append(t1 - t0)
+                    search.append(t2 - t1)
+                    expanded += stats.get("expanded", 0)
+                    lengths.append(len(path))
+                total = sum(build) + sum(search)
+                latency = np.percentile(np.array(search) * 1000, [50, 90, 99])
+                rows.append({
+                    "rows": r,
+                    "cols": c,
+                    "density": density,
+                    "algorithm": algorithm,
+                    "boards": len(spec["seeds"]),
+                    "boards_per_s": round(len(spec["seeds"]) / total, 3) if total else 0.0,
+                    "expanded_per_s": round(expanded / sum(search), 1) if sum(search) else 0.0,
+                    "build_ms_p50": round(float(np.median(build)) * 1000, 3),
+                    "search_ms_p50": round(float(latency[0]), 3),
+                    "search_ms_p90": round(float(latency[1]), 3),
+                    "search_ms_p99": round(float(latency[2]), 3),
+                    "solved": sum(1 for length in lengths if length > 0),
+                    "mean_path_length": round(float(np.mean(lengths)), 2),
+                })
+    return rows
+
+def run_mapf(spec):
+    """
+    Plans random fleets on one Board per (size, density, seed) and aggregates the
+    measurements per (size, density, method, agent count).
+    Each Board has one MultiAgentPlanner; the BFS trees rooted at a fleet's goals
+    are built before timing and shared by every method, so the solve time covers
+    the planning only.
+    :param spec: Dict with sizes, densities, seeds, agents and mapf.
+    :return: List of result rows (dicts).
+    """
+    from logic.mapf import MultiAgentPlanner, random_agents
+
+    rows = []
+    for r, c in spec["sizes"]:
+        for density in spec["densities"]:
+            n = min(int(density * r * c), r * c - 2)
+            samples = {}
+            for seed in spec["seeds"]:
+                board = Board(r=r, c=c, ix=0, iy=0, fx=r - 1, fy=c - 1, n=n, rng=seed)
+                planner = MultiAgentPlanner(board)
+                for k in spec["agents"]:
+                    agents = random_agents(board, k, seed)
+                    for _, goal in agents:
+                        planner.query.tree(goal)
+                    for method in spec["mapf"]:
+                        stats = {}
+                        t0 = time.perf_counter()
+                        paths = getattr(planner, method)(agents, stats=stats)
+                        samples.setdefault((method, k), []).append((time.perf_counter() - t0, bool(paths), stats))
+            for method in spec["mapf"]:
+                for k in spec["agents"]:
+                    runs = samples[(method, k)]
+                    latency = np.percentile([elapsed * 1000 for elapsed, _, _ in runs], [50, 90])
+                    solved = [stats for _, ok, stats in runs if ok]
+                    rows.append({
+                        "rows": r,
+                        "cols": c,
+                        "density": density,
+                        "method": method,
+                        "agents": k,
+                        "boards": len(runs),
+                        "solved": len(solved),
+                        "solve_ms_p50": round(float(latency[0]), 3),
+                        "solve_ms_p90": round(float(latency[1]), 3),
+                        "mean_expanded": round(float(np.mean([stats["expanded"] for _, _, stats in runs])), 1),
+                        "mean_sum_of_costs": round(float(np.mean([stats["sum_of_costs"] for stats in solved])), 2) if solved else None,
+                        "mean_makespan": round(float(np.mean([stats["makespan"] for stats in solved])), 2) if solved else None,
+                    })
+    return rows
+
+def write_rows(rows, fmt, out):
+    """
+    Writes result rows as CSV or JSON.
+    :param rows: List of result rows (dicts).
+    :param fmt: "csv" or "json".
+    :param out: Text file object.
+    :return: None
+    """
+    if fmt == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+    elif rows:
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def start_bench(argv):
+    """
+    Starts the non-interactive benchmark mode.
+    :param argv: Command line arguments after "bench".
+    :return: Exit status (int).
+    """
+    spec, args = parse_args(argv)
+    rows = run_mapf(spec) if "agents" in spec else run_bench(spec)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_rows(rows, args.format, f)
+    else:
+        write_rows(rows, args.format, sys.stdout)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(start_bench(sys.argv[1:]))
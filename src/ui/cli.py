@@ -2,8 +2,9 @@ import sys
 import re
 
 import ui.utils as utils
-from logic.board import Board
-from logic.bfs import bfs
+
+# Boards with more cells are not printed, so the path is never materialized just to draw it
+DISPLAY_MAX_CELLS = 10_000
 
 def run():
     try:
@@ -30,21 +31,65 @@ def run():
             print("\n>> [ERROR] Invalid number of obstacles.\n")
             return
 
-        b = Board(r=r, c=c, ix=ix, iy=iy, fx=fx, fy=fy, n=n)
+        # The logic layer (and NumPy) is only loaded once it is needed, so the CLI starts instantly
+        from logic.board import Board
+        from logic.grid import MOVEMENTS
+        from logic.query import PathQuery
+        from logic.solvers import ALGORITHMS, solve
+        from logic.stream import segments, stream_path, write_path
+
+        algorithm = input(f">> Enter algorithm ({', '.join(ALGORITHMS)}) [bfs]: ").strip().lower() or "bfs"
+        if algorithm not in ALGORITHMS:
+            print("\n>> [ERROR] Invalid algorithm.\n")
+            return
 
+        movement = input(f">> Enter movement model ({', '.join(MOVEMENTS)}) [4]: ").strip().lower() or "4"
+        if movement not in MOVEMENTS:
+            print("\n>> [ERROR] Invalid movement model.\n")
+            return
+
+        b = Board(r=r, c=c, ix=ix, iy=iy, fx=fx, fy=fy, n=n, movement=movement)
+
+        shown = r * c <= DISPLAY_MAX_CELLS
         b.info()
-        b.display() # Initial state of the Board
+        if shown:
+            b.display() # Initial state of the Board
+        else:
+            print(f"\n>> [INFO] Board too large to display ({r * c} cells > {DISPLAY_MAX_CELLS}).")
 
-        path = bfs(b.graph, (b.ix, b.iy), (b.fx, b.fy))
+        start, goal = (b.ix, b.iy), (b.fx, b.fy)
+        if algorithm == "bfs-grid" and movement != "any-angle":
+            # Same array BFS, run from the goal: every consumer walks its tree lazily, so the path is never a list
+            print(">> [INFO] bfs-grid path streamed from a BFS tree rooted at the final position.")
+            query = PathQuery(b)
+            _, dist = query.tree(goal)
+            moves = int(dist[query.grid.index(start)])
+            def nodes():
+                return stream_path(b, start, goal, query)
+        else:
+            path = solve(b, algorithm)
+            moves = len(path) - 1
+            def nodes():
+                return iter(path)
 
-        if len(path) == 0:
+        if moves < 0:
             print("\n>> [ERROR] No path found from initial to final position.\n")
             return
-        print(f"\nShortest path: {path}")
+        # Printed one straight segment per line, so long paths never become one giant string
+        print(f"\nShortest path ({moves} moves):")
+        for first, last in segments(nodes()):
+            print(f"  {first} -> {last}")
+
+        out = input("\n>> Save path to a CSV file? (file name, Enter to skip): ").strip()
+        if out:
+            with open(out, "w", newline="") as f:
+                lines = write_path(nodes(), f, compress=True)
+            print(f">> [INFO] {lines} segments written to {out}")
 
-        print("\nBoard with Path:\n")
-        final = b.draw_path(path) # Draw the path on the Board
-        final.display()  # Final state of the Board with path
+        if shown:
+            print("\nBoard with Path:\n")
+            final = b.draw_path(list(nodes())) # Draw the path on the Board (the overlay needs every cell)
+            final.display()  # Final state of the Board with path
 
         m = input("\n>> Close program? (y/n): ")
         if m.lower() == 'y':
@@ -1,14 +1,52 @@
+import queue
+import threading
 import tkinter as tk
-from dataclasses import field
+from tkinter import ttk
 
-import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.figure import Figure
 from matplotlib.colors import ListedColormap
+from matplotlib.collections import LineCollection
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 import ui.utils as utils
 from logic.board import Board
-from logic.bfs import bfs
+from logic.grid import MOVEMENTS
+from logic.instrument import instrumented
+from logic.solvers import ALGORITHMS, solve
+
+# Boards with more cells than this on a side are drawn without grid lines
+GRID_LINES_MAX = 60
+
+# How often the Tk loop checks the worker's progress, in milliseconds
+POLL_MS = 50
+
+# Drawing priority of each display code (cell value + 1): empty < obstacle < path < initial < final
+_RANK = np.array([1, 0, 3, 4, 2], dtype=np.int8)
+_CODE = np.argsort(_RANK).astype(np.int8) # Display code of each rank
+
+def downsample(codes, max_rows, max_cols):
+    """
+    Shrinks a grid of display codes to at most max_rows x max_cols pixels.
+    Each pixel shows the top-left cell of its block, unless the block holds a path
+    cell or an endpoint, which always stay visible.
+    :param codes: 2D array of display codes (0..4).
+    :param max_rows: Available pixel rows.
+    :param max_cols: Available pixel columns.
+    :return: 2D array of display codes; codes itself if it already fits.
+    """
+    rows, cols = codes.shape
+    step = max(1, -(-rows // max_rows), -(-cols // max_cols))
+    if step == 1:
+        return codes
+    out = codes[::step, ::step].copy()
+    pr, pc = out.shape
+    ranks = np.zeros((pr * step, pc * step), dtype=np.int8)
+    ranks[:rows, :cols] = _RANK[codes]
+    marks = ranks.reshape(pr, step, pc, step).max(axis=(1, 3))
+    keep = marks >= _RANK[4] # Blocks with a path cell or an endpoint
+    out[keep] = _CODE[marks[keep]]
+    return out
 
 class SimpleGUI:
     """
@@ -33,6 +71,8 @@ class SimpleGUI:
         self.board = None
         self.final = None
         self.path = None
+        self._job = None # Cancel event of the solve in flight, None when idle
+        self._pending = None # Latest Run request made while a solve was in flight
 
         # prepare colormap: map values (-1,0,1,2,3) -> indices (0..4)
         # colors: obstacle (black), empty (lightgray), initial (green), final (red), path (orange)
@@ -67,6 +107,12 @@ class SimpleGUI:
         self.fy = tk.Entry(self.root, validate='key', vcmd=self.vcmd)
         self.fx.grid(row=0, column=5)
         self.fy.grid(row=1, column=5)
+        tk.Label(self.root, text="Algorithm").grid(row=2, column=4)
+        self.algorithm = tk.StringVar(self.root, value="bfs")
+        tk.OptionMenu(self.root, self.algorithm, *ALGORITHMS).grid(row=2, column=5)
+        tk.Label(self.root, text="Movement").grid(row=3, column=4)
+        self.movement = tk.StringVar(self.root, value="4")
+        tk.OptionMenu(self.root, self.movement, *MOVEMENTS).grid(row=3, column=5)
 
     def _buttons(self):
         """
@@ -77,6 +123,15 @@ class SimpleGUI:
         quit_button = tk.Button(self.root, text="Quit", command=self.quit)
         run_button.grid(row=3, column=2)
         quit_button.grid(row=3, column=3)
+        # Progress of the solve running in the background
+        self._status = tk.StringVar(self.root, value="Idle")
+        progress_frame = tk.Frame(self.root)
+        progress_frame.grid(row=3, column=0)
+        self._progress = ttk.Progressbar(progress_frame, mode='indeterminate', length=100)
+        self._progress.pack()
+        tk.Label(progress_frame, textvariable=self._status).pack()
+        self._cancel_button = tk.Button(self.root, text="Cancel", command=self._cancel, state=tk.DISABLED)
+        self._cancel_button.grid(row=3, column=1)
 
     def _create_display_area(self):
         """
@@ -103,51 +158,70 @@ class SimpleGUI:
         self.final_canvas = FigureCanvasTkAgg(self.final_fig, master=right_frame)
         self.final_canvas.get_tk_widget().pack(fill='both', expand=True)
 
-        # initialize empty displays
-        self._clear_ax(self.initial_ax, "Initial Board")
-        self._clear_ax(self.final_ax, "Final Board")
+        # initialize empty displays; every axes keeps one image artist for its whole life
+        self._views = {}
+        self._init_view(self.initial_ax, "Initial Board")
+        self._init_view(self.final_ax, "Final Board")
 
-    def _clear_ax(self, ax, title):
-        ax.clear()
+    def _init_view(self, ax, title):
+        """
+        Creates the image artist of an axes; later plots only update its data.
+        :return: None
+        """
         ax.set_title(title)
         ax.set_xticks([])
         ax.set_yticks([])
-        ax.imshow([[0]], cmap=self._cmap, vmin=0, vmax=4, interpolation='nearest')
+        image = ax.imshow(np.zeros((1, 1), dtype=np.int8), cmap=self._cmap, vmin=0, vmax=4, interpolation='nearest',
+                          extent=(0, 1, 1, 0), aspect='equal', origin='upper')
+        self._views[ax] = {"image": image, "lines": None, "shape": None, "data": None}
         ax.figure.canvas.draw_idle()
 
+    @instrumented("gui.plot")
     def _plot_board_on_axes(self, ax, canvas, board_df, title):
         """
-        Plot a DataFrame board on the given axes and draw the Tk canvas.
+        Plot a board (2D array or DataFrame) on the given axes and draw the Tk canvas.
         Values expected: -1 obstacles, 0 empty, 1 initial, 2 final, 3 path.
         Each cell is rendered as a unit square so every square represents a position.
+        The axes' image artist is reused: the cells are downsampled to the axes'
+        pixel size and swapped in with set_data. When the board keeps its shape and
+        title only the image is repainted (blitted); nothing is redrawn if the
+        pixels did not change.
         """
-        ax.clear()
+        view = self._views[ax]
         if board_df is None:
             ax.set_title(title)
-            ax.figure.canvas.draw_idle()
+            canvas.draw_idle()
             return
-        arr = board_df.values.astype(int)
         # shift by +1 to map -1..3 -> 0..4 for ListedColormap
-        display_arr = arr + 1
-        nrows, ncols = display_arr.shape
+        codes = np.asarray(getattr(board_df, "values", board_df)).astype(np.int8) + 1
+        box = ax.get_window_extent()
+        pixels = downsample(codes, max(1, int(box.height)), max(1, int(box.width)))
+        same_frame = view["shape"] == codes.shape and ax.get_title() == title
+        if same_frame and np.array_equal(view["data"], pixels):
+            return
+        view["image"].set_data(pixels)
+        view["data"] = pixels
+        if same_frame: # Same extent, grid lines and title: repaint the image only
+            ax.draw_artist(view["image"])
+            if view["lines"] is not None:
+                ax.draw_artist(view["lines"])
+            canvas.blit(ax.bbox)
+            return
 
         # show each cell as a unit square: extent sets the image to span [0..ncols] x [0..nrows]
-        # use origin='upper' so (0,0) corresponds to top-left like array indices
-        ax.imshow(display_arr, cmap=self._cmap, vmin=0, vmax=4, interpolation='nearest',
-                  extent=(0, ncols, nrows, 0), aspect='equal', origin='upper')
-
+        # with (0,0) at the top-left like array indices
+        nrows, ncols = codes.shape
+        view["image"].set_extent((0, ncols, nrows, 0))
+        ax.set_xlim(0, ncols)
+        ax.set_ylim(nrows, 0)
+        if view["lines"] is not None:
+            view["lines"].remove()
+            view["lines"] = None
+        if max(nrows, ncols) <= GRID_LINES_MAX: # Cell borders, as a single artist
+            segments = [((x, 0), (x, nrows)) for x in range(ncols + 1)] + [((0, y), (ncols, y)) for y in range(nrows + 1)]
+            view["lines"] = ax.add_collection(LineCollection(segments, colors='black', linewidths=1), autolim=False)
+        view["shape"] = codes.shape
         ax.set_title(title)
-
-        # major ticks at cell centers (hidden labels), minor ticks at integer boundaries for grid lines
-        ax.set_xticks([i + 0.5 for i in range(ncols)])
-        ax.set_yticks([i + 0.5 for i in range(nrows)])
-        ax.set_xticklabels([])
-        ax.set_yticklabels([])
-
-        ax.set_xticks(list(range(ncols + 1)), minor=True)
-        ax.set_yticks(list(range(nrows + 1)), minor=True)
-        ax.grid(which='minor', color='black', linestyle='-', linewidth=1)
-
         canvas.draw_idle()
 
     def _info_popup(self, info):
@@ -171,34 +245,106 @@ class SimpleGUI:
     def _run(self):
         """
         Run the pathfinding algorithm based on user input.
+        The Board is built and solved on a worker thread so the window stays responsive.
+        Clicks made while a solve is in flight are coalesced: only the latest one runs
+        once the current solve ends.
         :return: None
         """
         validated = self._validate_inputs()
         if validated is None:
             return
-        r, c, ix, iy, fx, fy, n = validated
+        job = (validated, self.movement.get(), self.algorithm.get())
+        if self._job is not None:
+            self._pending = job
+            self._status.set("Run queued")
+            return
+        self._start(job)
 
-        self.board = Board(r=r, c=c, ix=ix, iy=iy, fx=fx, fy=fy, n=n)
+    def _start(self, job):
+        """
+        Starts a solve on a worker thread and polls its progress from the Tk loop.
+        :param job: (validated inputs, movement model, algorithm name)
+        :return: None
+        """
+        cancel = threading.Event()
+        events = queue.Queue()
+        self._job = cancel
+        self._pending = None
+        self._status.set("Building board...")
+        self._progress.start(10)
+        self._cancel_button.config(state=tk.NORMAL)
+        threading.Thread(target=solve_job, args=(job, events, cancel), daemon=True).start()
+        self.root.after(POLL_MS, self._poll, events, cancel)
+
+    def _poll(self, events, cancel):
+        """
+        Applies the events posted by the worker; reschedules itself until the solve ends.
+        :return: None
+        """
+        if cancel is not self._job: # Cancelled: the worker's results are dropped
+            return
+        try:
+            while True:
+                kind, value = events.get_nowait()
+                if kind == "stage":
+                    self._status.set(value)
+                elif kind == "done":
+                    self._idle("Done")
+                    self._show(*value)
+                    break
+                else: # "error"
+                    self._idle("Failed")
+                    self._info_popup(value)
+                    break
+        except queue.Empty:
+            self.root.after(POLL_MS, self._poll, events, cancel)
+            return
+        if self._pending is not None: # Coalesced clicks
+            self._start(self._pending)
 
-        self.board.info()
+    def _cancel(self):
+        """
+        Cancels the solve in flight and any queued Run. The worker stops at its next
+        stage boundary and its results are never shown.
+        :return: None
+        """
+        if self._job is not None:
+            self._job.set()
+            self._pending = None
+            self._idle("Cancelled")
+
+    def _idle(self, status):
+        self._job = None
+        self._progress.stop()
+        self._cancel_button.config(state=tk.DISABLED)
+        self._status.set(status)
+
+    def _show(self, board, path, final):
+        """
+        Displays the results of a finished solve.
+        :param board: Board that was solved.
+        :param path: Path found, or empty list.
+        :param final: PathOverlay with the path drawn, or None if no path was found.
+        :return: None
+        """
+        self.board, self.path, self.final = board, path, final
 
-        self.path = bfs(self.board.graph, (self.board.ix, self.board.iy), (self.board.fx, self.board.fy))
+        self.board.info()
 
         if len(self.path) == 0:
             print("\n>> [ERROR] No path found from initial to final position.\n")
             # still update initial board display
-            self._plot_board_on_axes(self.initial_ax, self.initial_canvas, self.board.board, "Initial Board")
+            self._plot_board_on_axes(self.initial_ax, self.initial_canvas, self.board.grid, "Initial Board")
             # clear final display
-            self._plot_board_on_axes(self.final_ax, self.final_canvas, self.board.board, "Final Board (no path)")
+            self._plot_board_on_axes(self.final_ax, self.final_canvas, self.board.grid, "Final Board (no path)")
             return
         print(f"\nShortest path: {self.path}")
 
         print("\nBoard with Path:\n")
-        self.final = self.board.draw_path(self.path)
 
         # update both canvases
-        self._plot_board_on_axes(self.initial_ax, self.initial_canvas, self.board.board, "Initial Board")
-        self._plot_board_on_axes(self.final_ax, self.final_canvas, self.final.board, "Final Board (with path)")
+        self._plot_board_on_axes(self.initial_ax, self.initial_canvas, self.board.grid, "Initial Board")
+        self._plot_board_on_axes(self.final_ax, self.final_canvas, self.final.grid, "Final Board (with path)")
 
     def _validate_inputs(self):
         """
@@ -249,6 +395,34 @@ class SimpleGUI:
         """
         self.root.quit()
 
+def solve_job(job, events, cancel):
+    """
+    Builds and solves a Board on a worker thread. Never touches Tk: progress and
+    results are posted to events as (kind, value) tuples, which the Tk loop polls.
+    Between stages it checks cancel and gives up if it is set.
+    :param job: (validated inputs, movement model, algorithm name)
+    :param events: queue.Queue receiving ("stage", text), ("done", (board, path, overlay)) or ("error", text).
+    :param cancel: threading.Event set by the GUI to cancel the solve.
+    :return: None
+    """
+    (r, c, ix, iy, fx, fy, n), movement, algorithm = job
+    try:
+        board = Board(r=r, c=c, ix=ix, iy=iy, fx=fx, fy=fy, n=n, movement=movement)
+        if cancel.is_set():
+            return
+        events.put(("stage", "Searching..."))
+        path = solve(board, algorithm)
+        if cancel.is_set():
+            return
+        final = None
+        if len(path) > 0:
+            events.put(("stage", "Drawing path..."))
+            final = board.draw_path(path)
+            final.grid # Mark the path cells here rather than on the Tk thread
+        events.put(("done", (board, path, final)))
+    except Exception as e:
+        events.put(("error", str(e)))
+
 def validate_int_only(p):
     """
     Validates that the input is either empty or an integer.
@@ -0,0 +1,219 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from logic.board import Board
+from logic.connectivity import Connectivity
+from logic.generators import LAYOUTS as GENERATORS
+from logic.graph import Graph
+from logic.solvers import ALGORITHMS, solve
+from ui.bench import parse_seeds, parse_sizes
+
+LAYOUTS = ("random",) + tuple(GENERATORS)
+
+def make_board(layout, r, c, density, seed):
+    """
+    Builds the Board of one benchmark case.
+    Random Boards place density * r * c obstacles between opposite corners; the
+    structured layouts (see Board.generate) ignore density and go from the first to
+    the last free cell of their largest region, e.g. from (0, 0) to the last room of a maze.
+    :param layout: One of LAYOUTS.
+    :param r: Number of rows.
+    :param c: Number of columns.
+    :param density: Obstacle density in [0, 1], random layout only.
+    :param seed: Seed of the Board's RNG.
+    :return: Board object.
+    """
+    if layout == "random":
+        n = min(int(density * r * c), r * c - 2)
+        return Board(r=r, c=c, ix=0, iy=0, fx=r - 1, fy=c - 1, n=n, rng=seed)
+    return Board.generate(layout, r, c, rng=seed)
+
+def cases(spec):
+    """
+    Expands the spec into (layout, rows, cols, density) cases; structured layouts get one case per size.
+    :param spec: Dict with layouts, sizes and densities.
+    :return: List of tuples.
+    """
+    out = []
+    for layout in spec["layouts"]:
+        for r, c in spec["sizes"]:
+            for density in (spec["densities"] if layout == "random" else [None]):
+                out.append((layout, r, c, density))
+    return out
+
+def case_key(layout, r, c, density, stage):
+    return f"{layout}/{r}x{c}" + (f"/d{density}" if density is not None else "") + f"/{stage}"
+
+def _measure(func, repeat):
+    """
+    Runs func repeat times.
+    :return: (list of elapsed seconds, result of the last run)
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - t0)
+    return times, result
+
+def run_suite(spec, log=None):
+    """
+    Times board generation, Graph building, the connectivity index and every search
+    for each case and seed. Searches run on a fresh Board each repeat, with its
+    connectivity index already built, so lazily built structures (e.g. the Graph
+    for bfs) count towards the search.
+    :param spec: Dict with layouts, sizes, densities, seeds, algorithms and repeat.
+    :param log: Optional text file receiving one progress line per case.
+    :return: Dict key -> {"min_ms", "median_ms", "runs"} plus "path_length" for searches.
+    """
+    results = {}
+    repeat = spec["repeat"]
+    for layout, r, c, density in cases(spec):
+        samples = {}
+        lengths = {}
+        for seed in spec["seeds"]:
+            build = lambda: make_board(layout, r, c, density, seed)
+            times, board = _measure(build, repeat)
+            samples.setdefault("board", []).extend(times)
+            times, _ = _measure(lambda: Graph().build_from_board(board.grid), repeat)
+            samples.setdefault("graph", []).extend(times)
+            times, _ = _measure(lambda: Connectivity(board.grid), repeat)
+            samples.setdefault("connectivity", []).extend(times)
+            for algorithm in spec["algorithms"]:
+                stage = f"search.{algorithm}"
+                for _ in range(repeat):
+                    board = build()
+                    board.has_path()
+                    t0 = time.perf_counter()
+                    path = solve(board, algorithm)
+                    samples.setdefault(stage, []).append(time.perf_counter() - t0)
+                lengths[stage] = lengths.get(stage, 0) + len(path)
+
+        for stage, times in samples.items():
+            ms = np.array(times) * 1000
+            record = {"min_ms": round(float(ms.min()), 4), "median_ms": round(float(np.median(ms)), 4), "runs": len(times)}
+            if stage in lengths:
+                record["path_length"] = lengths[stage]
+            results[case_key(layout, r, c, density, stage)] = record
+        if log is not None:
+            print(f"{case_key(layout, r, c, density, '*')}: done", file=log, flush=True)
+    return results
+
+def write_baseline(results, spec, path):
+    """
+    Saves results together with the spec and the environment they were measured on.
+    :param results: Dict returned by run_suite.
+    :param spec: Dict the results were measured with.
+    :param path: Output JSON file.
+    :return: None
+    """
+    meta = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "spec": {**spec, "sizes": [f"{r}x{c}" for r, c in spec["sizes"]]},
+    }
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+        f.write("\n")
+
+def compare(baseline, current, threshold=0.1, out=sys.stdout):
+    """
+    Compares two sets of results on their fastest run (least sensitive to noise).
+    A case is flagged SLOWER when it takes more than (1 + threshold) times the
+    baseline, and CHANGED when its total path length differs.
+    :param baseline: Dict key -> record, e.g. the "results" of a baseline file.
+    :param current: Dict key -> record.
+    :param threshold: Allowed relative slowdown.
+    :param out: Text file receiving the report.
+    :return: Number of flagged cases (int).
+    """
+    flagged = 0
+    print(f"{'case':<48}{'base_ms':>12}{'new_ms':>12}{'ratio':>8}", file=out)
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        ratio = new["min_ms"] / old["min_ms"] if old["min_ms"] > 0 else 1.0
+        flags = []
+        if ratio > 1 + threshold:
+            flags.append("SLOWER")
+        if old.get("path_length") != new.get("path_length"):
+            flags.append("CHANGED")
+        flagged += bool(flags)
+        print(f"{key:<48}{old['min_ms']:>12.3f}{new['min_ms']:>12.3f}{ratio:>8.2f}  {' '.join(flags)}".rstrip(), file=out)
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key:<48} missing from the new results", file=out)
+    return flagged
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="suite", description="Benchmark suite for logic/ with JSON baselines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write a JSON file.")
+    run.add_argument("--sizes", default="10,100,1000,4000", help="Board sizes, e.g. 100,200x50 (default: %(default)s)")
+    run.add_argument("--densities", default="0.1,0.2", help="Obstacle densities of random Boards (default: %(default)s)")
+    run.add_argument("--layouts", default="random,maze", help=f"Any of: {', '.join(LAYOUTS)} (default: %(default)s)")
+    run.add_argument("--seeds", default="0-2", help="Seeds, e.g. 0,1,5-9 (default: %(default)s)")
+    run.add_argument("--algorithms", default="bfs-grid,jps", help=f"Any of: {', '.join(ALGORITHMS)} (default: %(default)s)")
+    run.add_argument("--repeat", type=int, default=3, help="Runs per seed and stage (default: %(default)s)")
+    run.add_argument("--output", default="benchmark.json", help="Results file (default: %(default)s)")
+    run.add_argument("--compare", metavar="BASELINE", help="Compare the results against this baseline file.")
+    run.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown (default: %(default)s)")
+
+    cmp = commands.add_parser("compare", help="Compare two result files.")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown (default: %(default)s)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        args.spec = {
+            "layouts": [layout.strip() for layout in args.layouts.split(",")],
+            "sizes": parse_sizes(args.sizes),
+            "densities": [float(d) for d in args.densities.split(",")],
+            "seeds": parse_seeds(args.seeds),
+            "algorithms": [a.strip() for a in args.algorithms.split(",")],
+            "repeat": args.repeat,
+        }
+        for layout in args.spec["layouts"]:
+            if layout not in LAYOUTS:
+                parser.error(f"unknown layout '{layout}'")
+        for algorithm in args.spec["algorithms"]:
+            if algorithm not in ALGORITHMS:
+                parser.error(f"unknown algorithm '{algorithm}'")
+        if args.compare and os.path.abspath(args.compare) == os.path.abspath(args.output):
+            parser.error("--output would overwrite the --compare baseline; pick another file")
+    return args
+
+def start_suite(argv):
+    """
+    Starts the benchmark suite.
+    :param argv: Command line arguments after "suite".
+    :return: Exit status (int): 1 if the comparison flagged any case, 0 otherwise.
+    """
+    args = parse_args(argv)
+    if args.command == "run":
+        baseline = None
+        if args.compare: # Read before running, so a bad baseline fails fast
+            with open(args.compare) as f:
+                baseline = json.load(f)["results"]
+        results = run_suite(args.spec, log=sys.stderr)
+        write_baseline(results, args.spec, args.output)
+        if baseline is None:
+            return 0
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        with open(args.current) as f:
+            results = json.load(f)["results"]
+    return 1 if compare(baseline, results, args.threshold) else 0
+
+if __name__ == "__main__":
+    sys.exit(start_suite(sys.argv[1:]))
@@ -0,0 +1,59 @@
+import os
+import sys
+from collections import deque
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import logic.connectivity as connectivity
+from logic.board import Board
+from logic.connectivity import Connectivity, label_components
+
+def _flood(grid, start):
+    """Cells 4-connected to start, by a plain BFS."""
+    r, c = grid.shape
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        i, j = queue.popleft()
+        for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= ni < r and 0 <= nj < c and grid[ni, nj] != -1 and (ni, nj) not in seen:
+                seen.add((ni, nj))
+                queue.append((ni, nj))
+    return seen
+
+@pytest.mark.parametrize("chunk", [connectivity.CHUNK_CELLS, 7]) # 7 splits every Board into many blocks
+def test_labels_match_reachability(chunk, monkeypatch):
+    monkeypatch.setattr(connectivity, "CHUNK_CELLS", chunk)
+    for seed in range(60):
+        rng = np.random.default_rng(seed)
+        r, c = rng.integers(1, 20, size=2)
+        grid = np.where(rng.random((r, c)) < rng.random(), -1, 0).astype(np.int8)
+        labels, sizes = label_components(grid)
+        assert labels.dtype == np.int32 and labels.shape == grid.shape
+        assert (labels == -1).tolist() == (grid == -1).tolist()
+        seen = set()
+        for cell in zip(*np.nonzero(grid != -1)):
+            cell = (int(cell[0]), int(cell[1]))
+            if cell in seen:
+                continue
+            component = _flood(grid, cell)
+            seen |= component
+            label = labels[cell]
+            assert {(int(i), int(j)) for i, j in zip(*np.nonzero(labels == label))} == component
+            assert sizes[label] == len(component)
+        assert sizes.sum() == len(seen)
+
+def test_has_path_matches_search():
+    for seed in range(60):
+        board = Board(r=10, c=10, ix=0, iy=0, fx=9, fy=9, n=40, rng=seed)
+        index = Connectivity(board)
+        assert board.has_path() == ((9, 9) in _flood(board.grid, (0, 0)))
+        assert index.size((0, 0)) == len(_flood(board.grid, (0, 0)))
+
+def test_empty_boards():
+    for shape in [(0, 0), (0, 5), (5, 0)]:
+        labels, sizes = label_components(np.zeros(shape, dtype=np.int8))
+        assert labels.shape == shape and sizes.size == 0
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from logic.board import Board
+from logic.dstar import DStarLite
+
+def test_replan_with_diagonal_rounding():
+    # Keys of (3, 2) and the start differ by one ulp after replanning; this used to hang
+    grid = np.array([[1, -1, 0, 0], [0, 0, 0, -1], [0, 0, 0, -1], [-1, 0, 0, -1], [-1, -1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 2]])
+    board = Board(movement="8")
+    board.board_from_array(grid)
+    planner = DStarLite(board)
+    assert planner.path() == [(0, 0), (1, 0), (2, 1), (3, 2), (4, 2), (5, 2), (6, 3)]
+    board.add_obstacle(5, 2)
+    planner.update([(5, 2)])
+    assert planner.path() == [(0, 0), (1, 0), (2, 1), (3, 2), (4, 2), (4, 3), (5, 3), (6, 3)]
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from logic.board import Board
+from logic.mapf import MultiAgentPlanner, random_agents
+
+def _check(board, agents, paths):
+    """Asserts that the plan is legal and collision-free, with agents parked on their goals."""
+    assert len(paths) == len(agents)
+    edges = board.graph.edges
+    for (start, goal), path in zip(agents, paths):
+        assert path[0] == start and path[-1] == goal
+        for u, v in zip(path, path[1:]):
+            assert u == v or v in edges[u], f"illegal move {u} -> {v}"
+    horizon = max(len(path) for path in paths)
+    at = lambda path, t: path[min(t, len(path) - 1)]
+    for t in range(horizon):
+        cells = [at(path, t) for path in paths]
+        assert len(set(cells)) == len(cells), f"vertex conflict at t={t}"
+        moves = [(at(path, t), at(path, t + 1)) for path in paths]
+        for i, (u, v) in enumerate(moves):
+            for x, y in moves[i + 1:]:
+                assert (u, v) != (y, x) or u == v, f"swap at t={t}"
+                if u[0] != v[0] and u[1] != v[1]: # Diagonal: the other one may not take the other diagonal
+                    assert {x, y} != {(u[0], v[1]), (v[0], u[1])}, f"diagonal crossing at t={t}"
+
+@pytest.mark.parametrize("movement", ["4", "8"])
+@pytest.mark.parametrize("method", ["prioritized", "cbs"])
+def test_plans_are_collision_free(method, movement):
+    solved = 0
+    for seed in range(15):
+        board = Board(r=8, c=8, n=10, rng=seed, movement=movement)
+        agents = random_agents(board, 4, rng=seed)
+        paths = getattr(MultiAgentPlanner(board), method)(agents)
+        if paths:
+            _check(board, agents, paths)
+            solved += 1
+    assert solved
+
+def test_agents_do_not_cross_diagonally():
+    board = Board.from_array(np.zeros((2, 2), dtype=np.int8), start=(0, 0), goal=(1, 1), movement="8")
+    agents = [((0, 0), (1, 1)), ((0, 1), (1, 0))]
+    for method in ("prioritized", "cbs"):
+        paths = getattr(MultiAgentPlanner(board), method)(agents)
+        _check(board, agents, paths)
+        assert max(len(path) for path in paths) > 2 # One of them has to wait
@@ -0,0 +1,101 @@
+import heapq
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from logic.board import Board
+from logic.solvers import ALGORITHMS
+
+# Searches that minimize the number of moves, and the ones that minimize Graph.weight
+FEWEST_MOVES = ("bfs", "bfs-grid", "bfs-frontier", "bidirectional")
+CHEAPEST = ("astar", "jps", "dijkstra", "dijkstra-grid", "alt")
+SEEDS = range(40)
+
+def _board(seed, movement, costs=False):
+    rng = np.random.default_rng(seed)
+    r, c = rng.integers(2, 16, size=2)
+    ix, iy, fx, fy = int(rng.integers(r)), int(rng.integers(c)), int(rng.integers(r)), int(rng.integers(c))
+    if (ix, iy) == (fx, fy):
+        fx, fy = (ix + 1) % r, iy
+    n = int(rng.integers(0, r * c // 3 + 1))
+    board = Board(r=int(r), c=int(c), ix=ix, iy=iy, fx=fx, fy=fy, n=n, rng=rng, movement=movement)
+    if costs:
+        board.set_costs(rng.integers(1, 10, size=(r, c)))
+    return board
+
+def _reference(board, weighted):
+    """Distance from the initial position to the final one, by a plain Dijkstra over Graph.edges."""
+    graph, start, goal = board.graph, (board.ix, board.iy), (board.fx, board.fy)
+    dist = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node == goal:
+            return d
+        if d > dist[node]:
+            continue
+        for neighbor in graph.edges[node]:
+            nd = d + (graph.weight(node, neighbor) if weighted else 1)
+            if nd < dist.get(neighbor, float("inf")):
+                dist[neighbor] = nd
+                heapq.heappush(heap, (nd, neighbor))
+    return None
+
+def _cost(board, path, weighted):
+    """Cost of a path, checking that it joins the two positions with legal moves."""
+    assert path[0] == (board.ix, board.iy) and path[-1] == (board.fx, board.fy)
+    graph = board.graph
+    total = 0
+    for u, v in zip(path, path[1:]):
+        assert v in graph.edges[u], f"illegal move {u} -> {v}"
+        total += graph.weight(u, v) if weighted else 1
+    return total
+
+def _search(board, algorithm):
+    return ALGORITHMS[algorithm](board, (board.ix, board.iy), (board.fx, board.fy))
+
+@pytest.mark.parametrize("movement", ["4", "8"])
+@pytest.mark.parametrize("algorithm", FEWEST_MOVES + CHEAPEST)
+def test_optimal_without_costs(algorithm, movement):
+    weighted = algorithm in CHEAPEST
+    for seed in SEEDS:
+        board = _board(seed, movement)
+        best = _reference(board, weighted)
+        path = _search(board, algorithm)
+        if best is None:
+            assert path == []
+        else:
+            assert _cost(board, path, weighted) == pytest.approx(best)
+
+@pytest.mark.parametrize("movement", ["4", "8"])
+@pytest.mark.parametrize("algorithm", ["astar", "dijkstra", "dijkstra-grid", "alt"])
+def test_optimal_with_costs(algorithm, movement):
+    # 4-connected dijkstra-grid runs Dial's bucket queue, 8-connected falls back to heapq
+    for seed in SEEDS:
+        board = _board(seed, movement, costs=True)
+        best = _reference(board, True)
+        path = _search(board, algorithm)
+        if best is None:
+            assert path == []
+        else:
+            assert _cost(board, path, True) == pytest.approx(best)
+
+@pytest.mark.parametrize("movement", ["4", "8"])
+def test_hpa_is_valid_and_never_shorter(movement):
+    for seed in SEEDS:
+        board = _board(seed, movement)
+        best = _reference(board, True)
+        path = _search(board, "hpa")
+        if best is None:
+            assert path == []
+        else:
+            assert _cost(board, path, True) >= best - 1e-9
+
+def test_fractional_costs_are_rejected():
+    board = Board(r=3, c=3, ix=0, iy=0, fx=2, fy=2)
+    with pytest.raises(ValueError):
+        board.set_costs(np.full((3, 3), 1.5))